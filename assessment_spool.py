@@ -0,0 +1,225 @@
+"""Durable write-behind spool for completed reports.
+
+The request path appends each report (assessment row, answers and PDF) to
+a local SQLite file and returns; a background replayer saves it to
+PostgreSQL and deletes it from the spool. A write costs one local fsync
+whatever the database is doing, and reports made during an outage wait in
+the spool instead of being lost.
+
+Every entry carries an idempotency key that is stored with the assessment,
+so an entry replayed twice (a crash between the save and the delete, or
+two gunicorn workers draining the same file) is saved once. Entries that
+can't be saved are retried with exponential backoff, oldest due first.
+An entry the database rejects outright, or one still unsaved after
+SPOOL_MAX_ATTEMPTS tries, is marked dead: it is handed to the dead-letter
+callback and stays in the file for inspection for SPOOL_DEAD_RETENTION_DAYS,
+after which the replayer deletes it along with its PDF.
+"""
+import os
+import json
+import time
+import sqlite3
+import threading
+
+SPOOL_PATH = os.getenv('ASSESSMENT_SPOOL_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assessment_spool.db'))
+
+class AssessmentSpool:
+    def __init__(self, path, save, on_dead=None):
+        """save(key, record, pdf_bytes) stores one entry and returns a truthy id, None to
+        retry later, or raises if the entry can never be saved. on_dead(key, record,
+        pdf_bytes, error) is called once for each entry that is given up on.
+        """
+        self.path = path
+        self.save = save
+        self.on_dead = on_dead
+        self.poll_interval = float(os.getenv('SPOOL_POLL_SECONDS', 5))
+        self.lease_seconds = float(os.getenv('SPOOL_LEASE_SECONDS', 60))
+        self.retry_base = float(os.getenv('SPOOL_RETRY_BASE_SECONDS', 5))
+        self.retry_max = float(os.getenv('SPOOL_RETRY_MAX_SECONDS', 300))
+        # About four hours of database outage at the default backoff
+        self.max_attempts = int(os.getenv('SPOOL_MAX_ATTEMPTS', 50))
+        self.dead_retention = float(os.getenv('SPOOL_DEAD_RETENTION_DAYS', 7)) * 86400
+        # Purging scans the table, so it runs hourly rather than every poll
+        self.purge_interval = 3600
+        self._next_purge_at = 0
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._thread_pid = None
+        self._initialized = False
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        conn.execute('PRAGMA synchronous = FULL')
+        if not self._initialized:
+            conn.execute('PRAGMA journal_mode = WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS spool (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    idempotency_key TEXT NOT NULL UNIQUE,
+                    record TEXT NOT NULL,
+                    pdf_data BLOB,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL,
+                    created_at REAL NOT NULL,
+                    dead INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    died_at REAL
+                )
+            ''')
+            # Spool files written before dead-lettering or its retention existed
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(spool)')}
+            if 'dead' not in columns:
+                conn.execute('ALTER TABLE spool ADD COLUMN dead INTEGER NOT NULL DEFAULT 0')
+                conn.execute('ALTER TABLE spool ADD COLUMN last_error TEXT')
+            if 'died_at' not in columns:
+                conn.execute('ALTER TABLE spool ADD COLUMN died_at REAL')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_spool_due ON spool (next_attempt_at, id)')
+            self._initialized = True
+        return conn
+
+    def append(self, key, record, pdf_bytes=None):
+        """Durably store one entry and wake the replayer; False if the spool can't be written.
+
+        An entry already waiting under the same key is left alone; a dead one
+        is given a fresh set of attempts.
+        """
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                conn.execute('''
+                    INSERT INTO spool (idempotency_key, record, pdf_data, next_attempt_at, created_at) VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (idempotency_key) DO UPDATE SET
+                        dead = 0, attempts = 0, last_error = NULL, died_at = NULL,
+                        next_attempt_at = excluded.next_attempt_at
+                    WHERE dead
+                ''', (key, json.dumps(record, default=str), pdf_bytes, now, now))
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError) as e:
+            print(f"❌ Spool write failed: {e}")
+            return False
+
+        self.start()
+        self._wakeup.set()
+        return True
+
+    def start(self):
+        """Start the replayer thread for this process (again after a fork)"""
+        with self._lock:
+            if self._thread and self._thread.is_alive() and self._thread_pid == os.getpid():
+                return
+            self._thread = threading.Thread(target=self._run, name='assessment-spool', daemon=True)
+            self._thread_pid = os.getpid()
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                while self.replay_once():
+                    pass
+                if time.time() >= self._next_purge_at:
+                    self._next_purge_at = time.time() + self.purge_interval
+                    self.purge_dead()
+            except Exception as e:
+                print(f"❌ Spool replay error: {e}")
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def _claim(self, conn):
+        # BEGIN IMMEDIATE takes the write lock, so two replayers never claim the same entry
+        now = time.time()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('''
+                SELECT id, idempotency_key, record, pdf_data, attempts FROM spool
+                WHERE NOT dead AND next_attempt_at <= ?
+                ORDER BY next_attempt_at, id
+                LIMIT 1
+            ''', (now,)).fetchone()
+            if row:
+                conn.execute('UPDATE spool SET next_attempt_at = ? WHERE id = ?', (now + self.lease_seconds, row[0]))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return row
+
+    def replay_once(self):
+        """Save the next due entry; returns False when nothing is due or the save failed"""
+        conn = self._connect()
+        try:
+            row = self._claim(conn)
+            if not row:
+                return False
+
+            entry_id, key, record, pdf_data, attempts = row
+            record = json.loads(record)
+            attempts += 1
+            try:
+                saved = self.save(key, record, pdf_data)
+            except Exception as e:
+                # Rejected for good; the next entry may still save
+                self._kill(conn, entry_id, key, record, pdf_data, attempts, str(e))
+                return True
+            if saved:
+                conn.execute('DELETE FROM spool WHERE id = ?', (entry_id,))
+                return True
+
+            if attempts >= self.max_attempts:
+                self._kill(conn, entry_id, key, record, pdf_data, attempts, f"not saved after {attempts} attempts")
+                return False
+            delay = min(self.retry_base * 2 ** (attempts - 1), self.retry_max)
+            conn.execute('UPDATE spool SET attempts = ?, next_attempt_at = ? WHERE id = ?',
+                         (attempts, time.time() + delay, entry_id))
+            print(f"⏳ Spooled report {key} not saved (attempt {attempts}), retrying in {delay:.0f}s")
+            # The database is most likely down; leave the rest for the next round
+            return False
+        finally:
+            conn.close()
+
+    def _kill(self, conn, entry_id, key, record, pdf_data, attempts, error):
+        conn.execute('UPDATE spool SET dead = 1, attempts = ?, last_error = ?, died_at = ? WHERE id = ?',
+                     (attempts, error, time.time(), entry_id))
+        print(f"☠️ Spooled report {key} dead after {attempts} attempt(s): {error}")
+        if self.on_dead is not None:
+            try:
+                self.on_dead(key, record, pdf_data, error)
+            except Exception as e:
+                print(f"❌ Spool dead-letter handler failed for {key}: {e}")
+
+    def purge_dead(self):
+        """Delete dead entries, PDFs included, that have been kept past the retention; returns how many"""
+        cutoff = time.time() - self.dead_retention
+        conn = self._connect()
+        try:
+            # Entries that died before died_at existed count from when they were spooled
+            purged = conn.execute('DELETE FROM spool WHERE dead AND COALESCE(died_at, created_at) < ?',
+                                  (cutoff,)).rowcount
+        finally:
+            conn.close()
+        if purged:
+            print(f"🧹 Purged {purged} dead spool entries older than {self.dead_retention / 86400:g} days")
+        return purged
+
+    def stats(self):
+        """Entries waiting in the spool, for metrics"""
+        try:
+            conn = self._connect()
+            try:
+                pending, oldest, retrying, dead = conn.execute('''
+                    SELECT COUNT(*) FILTER (WHERE NOT dead), MIN(created_at) FILTER (WHERE NOT dead),
+                           COALESCE(SUM(attempts > 0 AND NOT dead), 0), COALESCE(SUM(dead), 0)
+                    FROM spool
+                ''').fetchone()
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError) as e:
+            return {'error': str(e)}
+        return {
+            'pending': pending,
+            'retrying': retrying,
+            'dead': dead,
+            'oldest_age_seconds': round(time.time() - oldest, 1) if oldest else 0
+        }
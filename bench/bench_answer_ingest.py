@@ -0,0 +1,79 @@
+"""Answer ingest benchmark: one INSERT per answer vs the batched write.
+
+    python bench/bench_answer_ingest.py [--assessments 300] [--mode TRL]
+
+Needs the DATABASE_* environment variables and an initialized schema
+(flask init-db). Each assessment is written in its own transaction and
+rolled back, so the database is left as it was; commit time is therefore
+not included. "row-by-row" is the write path before answers were batched,
+"batched" is insert_assessment(), which the app uses today; both write the
+same assessments row, answers and statistics rollup.
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database_functions import (
+    db_connection, insert_assessment, insert_assessment_row, update_statistics_rollup,
+    tcp_answer_rows, standard_answer_rows, TCP_ANSWER_INSERT, STANDARD_ANSWER_INSERT
+)
+
+def sample_assessment(mode):
+    if mode == 'TCP':
+        dimensions = [{'name': f'Dimension {i}', 'questions': ['q'] * size} for i, size in enumerate((3, 3, 3, 2, 2, 2))]
+        return {'mode': 'TCP', 'language': 'english', 'technology_title': 'Bench',
+                'tcp_data': {'dimensions': dimensions}, 'answers': [2] * 15}
+    return {'mode': 'TRL', 'language': 'english', 'technology_title': 'Bench',
+            'answers': [[True] * 5] + [[True] * 4] * 9}
+
+def answer_rows(assessment_id, data):
+    if data['mode'] == 'TCP':
+        return tcp_answer_rows(assessment_id, data)
+    return standard_answer_rows(assessment_id, data)
+
+def insert_row_by_row(cur, data):
+    """The write path before batching: one statement (and round trip) per answer.
+
+    Everything else (the assessments row, the statistics rollup) is the
+    same as insert_assessment, so only the answer writes differ.
+    """
+    assessment_id = insert_assessment_row(cur, data)
+    statement = TCP_ANSWER_INSERT if data['mode'] == 'TCP' else STANDARD_ANSWER_INSERT
+    for row in answer_rows(assessment_id, data):
+        cur.execute(statement, row)
+    update_statistics_rollup(cur, assessment_id)
+
+def run(conn, write, data, count):
+    latencies = []
+    with conn.cursor() as cur:
+        for _ in range(count):
+            start = time.perf_counter()
+            write(cur, data)
+            latencies.append(time.perf_counter() - start)
+            conn.rollback()
+    return latencies
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark answer-row ingest")
+    parser.add_argument('--assessments', type=int, default=300)
+    parser.add_argument('--mode', choices=('TRL', 'TCP'), default='TRL')
+    args = parser.parse_args(argv)
+
+    data = sample_assessment(args.mode)
+    rows_per_assessment = len(answer_rows(0, data))
+    with db_connection() as conn:
+        if not conn:
+            raise SystemExit("Database unavailable (check the DATABASE_* variables)")
+        for label, write in (('row-by-row', insert_row_by_row), ('batched', insert_assessment)):
+            run(conn, write, data, 10)  # warm up
+            latencies = sorted(run(conn, write, data, args.assessments))
+            total = sum(latencies)
+            print(f"{label:>10}: {total / len(latencies) * 1000:.2f} ms/assessment "
+                  f"(p95 {latencies[int(len(latencies) * 0.95)] * 1000:.2f} ms), "
+                  f"{rows_per_assessment * len(latencies) / total:,.0f} answer rows/s")
+
+if __name__ == "__main__":
+    main()
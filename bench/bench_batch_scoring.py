@@ -0,0 +1,80 @@
+"""Bulk scoring: separate /api/assess requests vs one /api/assess/batch request.
+
+    python bench/bench_batch_scoring.py [--items 10000] [--repeat 3]
+
+Scores the same mixed TRL/IRL/MRL/TCP items (both languages, some TCP
+answers fractional) four ways: assess() per item and assess_batch() on
+the whole list, then through the Flask test client as one request per
+item and as a single batch request. Prints the best time of each and the
+items/sec. No database is needed.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scoring import assess, assess_batch
+
+def sample_items(count, seed=17):
+    rng = random.Random(seed)
+    items = []
+    for index in range(count):
+        mode = ('TRL', 'IRL', 'MRL', 'TCP')[index % 4]
+        if mode == 'TCP':
+            answers = [rng.choice((1, 2, 3)) for _ in range(15)]
+            if index % 20 == 3:
+                answers[0] = 2.5
+        else:
+            answers = [[rng.random() < 0.9 for _ in range(4)] for _ in range(rng.randint(1, 9))]
+        items.append({
+            'mode': mode,
+            'language': rng.choice(('english', 'filipino')),
+            'technology_title': f'Bench item {index}',
+            'description': 'A technology description of typical length. ' * 4,
+            'answers': answers,
+            'lean': True
+        })
+    return items
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark bulk assessment scoring")
+    parser.add_argument('--items', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    import app
+    client = app.app.test_client()
+    items = sample_items(args.items)
+    assess_batch(items[:100])  # load NumPy outside the timing
+
+    def separate_requests():
+        for item in items:
+            assert client.post('/api/assess', json=item).status_code == 200
+
+    def batch_request():
+        assert client.post('/api/assess/batch', json=items).status_code == 200
+
+    runs = (
+        ('assess() per item', lambda: [assess(item) for item in items]),
+        ('assess_batch()', lambda: assess_batch(items)),
+        ('POST /api/assess x N', separate_requests),
+        ('POST /api/assess/batch', batch_request),
+    )
+    print(f"{args.items} items, best of {args.repeat}")
+    for label, func in runs:
+        elapsed = best_of(args.repeat, func)
+        print(f"{label:>24}: {elapsed * 1000:8.0f} ms, {args.items / elapsed:>10,.0f} items/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""PDF render throughput against the number of render workers.
+
+    python bench/bench_pdf_render.py [--workers 0,1,2,4] [--reports 96] [--threads 8]
+
+Each setting builds a fresh PDFRenderPool (PDF_RENDER_WORKERS=n; 0 renders
+in the calling thread, like the app did before the pool) and renders the
+same TRL report from several request threads at once. Prints PDFs/sec and
+the mean latency per render.
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pdf_report
+
+SAMPLE_REPORT = {
+    'mode': 'TRL',
+    'mode_full': 'Technology Readiness Level',
+    'technology_title': 'Render benchmark',
+    'description': 'A technology description of typical length. ' * 8,
+    'language': 'english',
+    'level': 3,
+    'explanation': 'An explanation paragraph. ' * 40,
+    'answers': [[True] * 4] * 10,
+    'questions': [{'level': i, 'title': f'Level {i}', 'checks': [f'Check {j} for level {i}' for j in range(4)]} for i in range(10)],
+    'timestamp': '2026-01-01T00:00:00'
+}
+
+def bench(workers, reports, threads):
+    os.environ['PDF_RENDER_WORKERS'] = str(workers)
+    pool = pdf_report.PDFRenderPool()
+    pool.queue_wait = 600
+    pool.render(SAMPLE_REPORT)  # start the workers outside the timing
+
+    latencies = []
+    lock = threading.Lock()
+
+    def render_some(count):
+        for _ in range(count):
+            start = time.perf_counter()
+            pool.render(SAMPLE_REPORT)
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    per_thread = reports // threads
+    started = time.perf_counter()
+    runners = [threading.Thread(target=render_some, args=(per_thread,)) for _ in range(threads)]
+    for runner in runners:
+        runner.start()
+    for runner in runners:
+        runner.join()
+    elapsed = time.perf_counter() - started
+
+    if pool._pool is not None:
+        pool._pool.terminate()
+    return len(latencies) / elapsed, sum(latencies) / len(latencies)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark PDF render throughput per worker count")
+    parser.add_argument('--workers', default='0,1,2,4', help="comma-separated worker counts")
+    parser.add_argument('--reports', type=int, default=96)
+    parser.add_argument('--threads', type=int, default=8, help="concurrent request threads")
+    args = parser.parse_args(argv)
+
+    print(f"{os.cpu_count()} CPUs, {args.reports} reports from {args.threads} threads")
+    for workers in (int(value) for value in args.workers.split(',')):
+        rate, latency = bench(workers, args.reports, args.threads)
+        print(f"workers={workers}: {rate:.1f} PDFs/s, {latency * 1000:.0f} ms mean latency")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Circuit breaker for a dependency that can go away (the database).
+
+closed     calls go through; consecutive failures are counted
+open       calls fail immediately, without waiting on timeouts
+half-open  one trial call is let through; success closes the breaker,
+           failure opens it again
+
+While open, a background probe retries the dependency every reset_timeout
+seconds and closes the breaker as soon as it answers, so recovery doesn't
+wait for user traffic. State is per process.
+"""
+import os
+import time
+import threading
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+class CircuitBreaker:
+    def __init__(self, name, probe=None, failure_threshold=3, reset_timeout=15.0):
+        self.name = name
+        self.probe = probe
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._probe_thread = None
+        self._probe_pid = None
+        self._stats = {'trips': 0, 'fast_failures': 0, 'probes': 0}
+
+    @property
+    def state(self):
+        return self._state
+
+    def allow(self):
+        """True if a call may go ahead; a half-open breaker lets one trial call through"""
+        with self._lock:
+            if self._state == CLOSED or self._claim_trial():
+                return True
+            self._stats['fast_failures'] += 1
+        # A worker that forked with the breaker open needs its own probe
+        self._start_probe()
+        return False
+
+    def _claim_trial(self):
+        # Called with the lock held
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+        if self._state == HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def retry_after(self):
+        """Seconds until the next trial call, 0 when closed"""
+        with self._lock:
+            if self._state == CLOSED:
+                return 0
+            if self._state == HALF_OPEN:
+                return 1
+            return max(1, int(self._opened_at + self.reset_timeout - time.monotonic()) + 1)
+
+    def record_success(self):
+        with self._lock:
+            was_closed = self._state == CLOSED
+            self._state = CLOSED
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+        if not was_closed:
+            print(f"✅ {self.name} circuit closed, connection restored")
+
+    def release_trial(self):
+        """Give back a trial call that ended without showing whether the dependency is up"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == HALF_OPEN or (self._state == CLOSED and self._failures >= self.failure_threshold):
+                if self._state == CLOSED:
+                    self._stats['trips'] += 1
+                    print(f"⚡ {self.name} circuit open after {self._failures} failures, failing fast for {self.reset_timeout:.0f}s")
+                self._state = OPEN
+            if self._state == OPEN:
+                self._opened_at = time.monotonic()
+            else:
+                return
+        self._start_probe()
+
+    def _start_probe(self):
+        if self.probe is None:
+            return
+        with self._lock:
+            if self._probe_thread and self._probe_thread.is_alive() and self._probe_pid == os.getpid():
+                return
+            self._probe_thread = threading.Thread(target=self._run_probe, name=f'{self.name}-probe', daemon=True)
+            self._probe_pid = os.getpid()
+            self._probe_thread.start()
+
+    def _run_probe(self):
+        while True:
+            with self._lock:
+                if self._state == CLOSED:
+                    return
+                claimed = self._claim_trial()
+                wait = self._opened_at + self.reset_timeout - time.monotonic() if self._state == OPEN else 1
+            if not claimed:
+                # Not due yet, or a request is already making the trial call
+                time.sleep(max(wait, 0.1))
+                continue
+
+            self._stats['probes'] += 1
+            try:
+                self.probe()
+            except Exception as e:
+                print(f"🔌 {self.name} probe failed: {e}")
+                self.record_failure()
+            else:
+                self.record_success()
+
+    def snapshot(self):
+        """Breaker state and counters, for metrics"""
+        with self._lock:
+            snapshot = {
+                'state': self._state,
+                'consecutive_failures': self._failures,
+                'open_for_seconds': round(time.monotonic() - self._opened_at, 1) if self._opened_at else 0
+            }
+            snapshot.update(self._stats)
+        return snapshot
@@ -1,266 +1,896 @@
 import os
-import psycopg
-from psycopg.rows import dict_row
+import base64
+import threading
+import time
+import uuid
+from contextlib import contextmanager
 from datetime import datetime
+from circuit_breaker import CircuitBreaker
+from schema_migrations import migrate
 
-def get_db_connection():
-    """Get PostgreSQL database connection using psycopg3"""
-    try:
-        host = os.getenv('DATABASE_HOST')
-        dbname = os.getenv('DATABASE_NAME')
-        user = os.getenv('DATABASE_USER')
-        password = os.getenv('DATABASE_PASSWORD')
-        port = int(os.getenv('DATABASE_PORT', 5432))
+# psycopg is imported on first use so processes that never touch the
+# database (or haven't yet) don't pay for loading it. get_pool() does the
+# first import under its lock; the helpers below import from psycopg only
+# once they hold a connection, so background threads never race the import.
+
+# Process-wide connection pool. It is created lazily and re-created after a
+# fork so every gunicorn worker owns its own sockets.
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+PDF_CHUNK_SIZE = int(os.getenv('PDF_CHUNK_SIZE', 256 * 1024))
+PDF_PAGE_SIZE = int(os.getenv('PDF_PAGE_SIZE', 50))
+DB_PROBE_TIMEOUT = int(os.getenv('DB_PROBE_TIMEOUT', 3))
+_checkout_stats = {
+    'checkouts': 0,
+    'checkout_errors': 0,
+    'checkout_exhausted': 0,
+    'in_use': 0,
+    'checkout_ms_total': 0.0,
+    'checkout_ms_max': 0.0
+}
+
+# Schema bootstrap runs off the import path; schema_migrations serializes
+# concurrent runs with an advisory lock so workers don't race the DDL
+SCHEMA_RETRY_SECONDS = float(os.getenv('SCHEMA_RETRY_SECONDS', 30))
+_schema_ready = threading.Event()
+_schema_thread = None
+_schema_thread_pid = None
+_schema_unconfigured = False
+
+def connection_kwargs():
+    """psycopg connection settings from the environment, or None if incomplete"""
+    host = os.getenv('DATABASE_HOST')
+    dbname = os.getenv('DATABASE_NAME')
+    user = os.getenv('DATABASE_USER')
+    password = os.getenv('DATABASE_PASSWORD')
+    port = int(os.getenv('DATABASE_PORT', 5432))
+    
+    if not all([host, dbname, user, password]):
+        print("Missing required database environment variables!")
+        return None
+    
+    return {
+        'host': host,
+        'dbname': dbname,
+        'user': user,
+        'password': password,
+        'port': port,
+        'connect_timeout': 10
+    }
+
+def get_pool():
+    """Get the PostgreSQL connection pool for this process"""
+    global _pool, _pool_pid
+    if _pool is not None and _pool_pid == os.getpid():
+        return _pool
+    
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            return _pool
         
-        if not all([host, dbname, user, password]):
-            print("Missing required database environment variables!")
+        kwargs = connection_kwargs()
+        if kwargs is None:
             return None
         
-        conn = psycopg.connect(
-            host=host,
-            dbname=dbname,
-            user=user,
-            password=password,
-            port=port,
-            connect_timeout=10
-        )
-        return conn
-    except Exception as e:
-        print(f"Database connection error: {e}")
-        return None
+        try:
+            from psycopg_pool import ConnectionPool
+            _pool = ConnectionPool(
+                kwargs=kwargs,
+                min_size=int(os.getenv('DB_POOL_MIN_SIZE', 1)),
+                max_size=int(os.getenv('DB_POOL_MAX_SIZE', 5)),
+                timeout=float(os.getenv('DB_POOL_TIMEOUT', 10)),
+                max_idle=float(os.getenv('DB_POOL_MAX_IDLE', 300)),
+                max_lifetime=float(os.getenv('DB_POOL_MAX_LIFETIME', 1800)),
+                check=ConnectionPool.check_connection,
+                name='mmsu-assessments',
+                open=True
+            )
+            _pool_pid = os.getpid()
+            # Connections checked out before a fork belong to the parent's pool
+            _checkout_stats['in_use'] = 0
+            return _pool
+        except Exception as e:
+            print(f"Database pool error: {e}")
+            return None
 
-def init_database():
-    """Initialize PostgreSQL database with required tables"""
-    conn = get_db_connection()
-    if not conn:
-        return
+def probe_database():
+    """Open a fresh connection and run SELECT 1, raising if the database doesn't answer"""
+    import psycopg
+    kwargs = connection_kwargs()
+    if kwargs is None:
+        raise RuntimeError("database is not configured")
+    kwargs['connect_timeout'] = DB_PROBE_TIMEOUT
+    with psycopg.connect(**kwargs) as conn:
+        conn.execute('SELECT 1')
+
+# Shared by every helper below: after repeated checkout failures they stop
+# waiting on connect timeouts and get None straight away until a probe succeeds
+db_breaker = CircuitBreaker(
+    'database',
+    probe=probe_database,
+    failure_threshold=int(os.getenv('DB_BREAKER_FAILURES', 3)),
+    reset_timeout=float(os.getenv('DB_BREAKER_RESET_SECONDS', 15))
+)
+
+def pool_saturated(pool):
+    """True if every connection the pool may open is checked out, so a timeout means busy, not down"""
+    with _pool_lock:
+        return _checkout_stats['in_use'] >= pool.max_size
+
+@contextmanager
+def db_connection():
+    """Borrow a pooled connection; yields None if the database is unavailable"""
+    pool = get_pool()
+    conn = None
+    
+    if pool and not db_breaker.allow():
+        # Circuit open: fail fast instead of waiting out the pool timeout
+        pool = None
+    
+    if pool:
+        start = time.perf_counter()
+        try:
+            conn = pool.getconn()
+        except Exception as e:
+            from psycopg import OperationalError
+            from psycopg_pool import PoolTimeout
+            if isinstance(e, PoolTimeout) and pool_saturated(pool):
+                # Every connection is open and checked out: the database is
+                # busy, not down, so this must not count towards tripping
+                print(f"Database pool exhausted: {e}")
+                db_breaker.release_trial()
+                counter = 'checkout_exhausted'
+            else:
+                print(f"Database connection error: {e}")
+                if isinstance(e, (PoolTimeout, OperationalError)):
+                    db_breaker.record_failure()
+                else:
+                    db_breaker.release_trial()
+                counter = 'checkout_errors'
+            with _pool_lock:
+                _checkout_stats[counter] += 1
+        else:
+            db_breaker.record_success()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with _pool_lock:
+                _checkout_stats['checkouts'] += 1
+                _checkout_stats['in_use'] += 1
+                _checkout_stats['checkout_ms_total'] += elapsed_ms
+                _checkout_stats['checkout_ms_max'] = max(_checkout_stats['checkout_ms_max'], elapsed_ms)
     
     try:
-        with conn.cursor() as cur:
-            cur.execute('''
-                CREATE TABLE IF NOT EXISTS assessments (
-                    id SERIAL PRIMARY KEY,
-                    session_id VARCHAR(255),
-                    assessment_type VARCHAR(10),
-                    technology_title VARCHAR(500),
-                    description TEXT,
-                    level_achieved INTEGER,
-                    recommended_pathway VARCHAR(100),
-                    language VARCHAR(10),
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    ip_address INET,
-                    user_agent TEXT,
-                    consent_given BOOLEAN DEFAULT TRUE,
-                    completed BOOLEAN DEFAULT TRUE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    pdf_data BYTEA,
-                    pdf_filename VARCHAR(255)
-                )
-            ''')
-            
-            cur.execute('ALTER TABLE assessments ADD COLUMN IF NOT EXISTS pdf_data BYTEA')
-            cur.execute('ALTER TABLE assessments ADD COLUMN IF NOT EXISTS pdf_filename VARCHAR(255)')
-            
-            cur.execute('''
-                CREATE TABLE IF NOT EXISTS assessment_answers (
-                    id SERIAL PRIMARY KEY,
-                    assessment_id INTEGER REFERENCES assessments(id) ON DELETE CASCADE,
-                    level_number INTEGER,
-                    question_index INTEGER,
-                    answer BOOLEAN,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            cur.execute('''
-                CREATE TABLE IF NOT EXISTS tcp_answers (
-                    id SERIAL PRIMARY KEY,
-                    assessment_id INTEGER REFERENCES assessments(id) ON DELETE CASCADE,
-                    dimension_name VARCHAR(100),
-                    question_index INTEGER,
-                    score INTEGER,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            cur.execute('CREATE INDEX IF NOT EXISTS idx_assessments_timestamp ON assessments(timestamp)')
-            cur.execute('CREATE INDEX IF NOT EXISTS idx_assessments_type ON assessments(assessment_type)')
-            
-            conn.commit()
-            print("Database initialized successfully!")
-            
-    except Exception as e:
-        print(f"Database initialization error: {e}")
-        conn.rollback()
+        yield conn
     finally:
-        conn.close()
+        if conn is not None:
+            if conn.broken:
+                db_breaker.record_failure()
+            try:
+                from psycopg.pq import TransactionStatus
+                if conn.info.transaction_status != TransactionStatus.IDLE:
+                    conn.rollback()
+            except Exception:
+                pass
+            with _pool_lock:
+                _checkout_stats['in_use'] -= 1
+            pool.putconn(conn)
 
-def save_pdf_to_db(pdf_buffer, filename, assessment_id):
-    """Save PDF to database"""
-    conn = get_db_connection()
-    if not conn:
-        return None
+def close_pool():
+    """Close this process's pool, e.g. in a preloading master before it forks"""
+    global _pool, _pool_pid
+    with _pool_lock:
+        pool, _pool, _pool_pid = _pool, None, None
+    if pool is not None:
+        pool.close()
+
+def get_pool_stats():
+    """Get connection pool usage and circuit breaker statistics for this worker"""
+    with _pool_lock:
+        checkout = dict(_checkout_stats)
     
-    try:
-        with conn.cursor() as cur:
-            pdf_data = pdf_buffer.getvalue()
-            cur.execute('''
-                UPDATE assessments 
-                SET pdf_data = %s, pdf_filename = %s 
-                WHERE id = %s
-            ''', (pdf_data, filename, assessment_id))
-            conn.commit()
-            print(f"💾 Enhanced PDF saved: {filename}")
+    avg_ms = checkout['checkout_ms_total'] / checkout['checkouts'] if checkout['checkouts'] else 0
+    stats = {
+        'pid': os.getpid(),
+        'checkouts': checkout['checkouts'],
+        'checkout_errors': checkout['checkout_errors'],
+        'checkout_exhausted': checkout['checkout_exhausted'],
+        'checkout_ms_avg': round(avg_ms, 2),
+        'checkout_ms_max': round(checkout['checkout_ms_max'], 2),
+        'circuit_breaker': db_breaker.snapshot()
+    }
+    
+    pool = _pool if _pool_pid == os.getpid() else None
+    if pool:
+        pool_stats = pool.get_stats()
+        stats.update({
+            'pool_min': pool_stats.get('pool_min', 0),
+            'pool_max': pool_stats.get('pool_max', 0),
+            'pool_size': pool_stats.get('pool_size', 0),
+            'pool_available': pool_stats.get('pool_available', 0),
+            'in_use': pool_stats.get('pool_size', 0) - pool_stats.get('pool_available', 0),
+            'waiting': pool_stats.get('requests_waiting', 0),
+            'connections_lost': pool_stats.get('connections_lost', 0)
+        })
+    return stats
+
+def migrate_schema(dry_run=False):
+    """Apply pending schema migrations (see schema_migrations); returns True on success"""
+    with db_connection() as conn:
+        if not conn:
+            return False
+        
+        try:
+            migrate(conn, dry_run=dry_run)
             return True
-    except Exception as e:
-        print(f"Error saving PDF: {e}")
+        except Exception as e:
+            print(f"Schema migration error: {e}")
+            return False
+
+def init_database():
+    """Bring the PostgreSQL schema up to date; returns True on success"""
+    if not migrate_schema():
+        print("Database initialization failed")
         return False
-    finally:
-        conn.close()
+    _schema_ready.set()
+    print("Database initialized successfully!")
+    return True
 
-def get_all_pdfs():
-    """Get all PDFs from database for admin view"""
-    conn = get_db_connection()
-    if not conn:
-        return []
+def start_schema_bootstrap():
+    """Run init_database in a background thread, retrying until it succeeds.
     
+    Called once per process (again after a fork); returns immediately so
+    routes that don't need the database are served while it is asleep or
+    unreachable. Without database settings there is nothing to retry, so
+    the thread gives up at once.
+    """
+    global _schema_thread, _schema_thread_pid
+    with _pool_lock:
+        if _schema_ready.is_set() or _schema_unconfigured or (_schema_thread and _schema_thread.is_alive() and _schema_thread_pid == os.getpid()):
+            return
+        _schema_thread = threading.Thread(target=_bootstrap_schema, name='schema-bootstrap', daemon=True)
+        _schema_thread_pid = os.getpid()
+        _schema_thread.start()
+
+def _bootstrap_schema():
+    global _schema_unconfigured
+    if connection_kwargs() is None:
+        print("⚠️ Database not configured, skipping schema bootstrap")
+        _schema_unconfigured = True
+        return
+    while not init_database():
+        print(f"⏳ Database not ready, retrying schema bootstrap in {SCHEMA_RETRY_SECONDS:.0f}s")
+        time.sleep(SCHEMA_RETRY_SECONDS)
+
+def insert_pdf_blob(cur, assessment_id, pdf_data):
+    """Store (or replace) an assessment's PDF; its filename is on the assessments row"""
+    cur.execute('''
+        INSERT INTO report_blobs (assessment_id, pdf_data, byte_size)
+        VALUES (%s, %s, %s)
+        ON CONFLICT (assessment_id)
+        DO UPDATE SET pdf_data = EXCLUDED.pdf_data, byte_size = EXCLUDED.byte_size,
+                      created_at = CURRENT_TIMESTAMP
+    ''', (assessment_id, pdf_data, len(pdf_data)))
+
+def encode_pdf_cursor(row):
+    """Encode the (timestamp, id) position of an archive row as an opaque cursor"""
+    raw = f"{row['timestamp'].isoformat()}|{row['id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def decode_pdf_cursor(cursor):
+    """Decode a PDF archive cursor; raises ValueError if it is malformed"""
     try:
-        with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute('''
-                SELECT id, technology_title, assessment_type, pdf_filename, 
-                       timestamp, language, level_achieved, recommended_pathway
-                FROM assessments 
-                WHERE pdf_data IS NOT NULL 
-                ORDER BY timestamp DESC
-            ''')
-            return [dict(row) for row in cur.fetchall()]
-    except Exception as e:
-        print(f"Error getting PDFs: {e}")
-        return []
-    finally:
-        conn.close()
+        padded = cursor + '=' * (-len(cursor) % 4)
+        timestamp, assessment_id = base64.urlsafe_b64decode(padded.encode()).decode().rsplit('|', 1)
+        return datetime.fromisoformat(timestamp), int(assessment_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+def get_pdfs_page(cursor=None, limit=PDF_PAGE_SIZE):
+    """Get one page of the PDF archive (newest first) and the cursor for the next page"""
+    position = decode_pdf_cursor(cursor) if cursor else None
+    
+    with db_connection() as conn:
+        if not conn:
+            return [], None
+        
+        from psycopg.rows import dict_row
+        try:
+            with conn.cursor(row_factory=dict_row) as cur:
+                query = '''
+                    SELECT id, technology_title, assessment_type, pdf_filename, 
+                           timestamp, language, level_achieved, recommended_pathway
+                    FROM assessments 
+                    WHERE pdf_filename IS NOT NULL 
+                '''
+                params = []
+                if position:
+                    query += 'AND (timestamp, id) < (%s, %s) '
+                    params.extend(position)
+                query += 'ORDER BY timestamp DESC, id DESC LIMIT %s'
+                params.append(limit + 1)
+                
+                cur.execute(query, params)
+                rows = [dict(row) for row in cur.fetchall()]
+                
+                next_cursor = None
+                if len(rows) > limit:
+                    rows = rows[:limit]
+                    next_cursor = encode_pdf_cursor(rows[-1])
+                return rows, next_cursor
+        except Exception as e:
+            print(f"Error getting PDFs: {e}")
+            return [], None
 
 def get_pdf_by_id(assessment_id):
     """Get specific PDF from database"""
-    conn = get_db_connection()
-    if not conn:
-        return None, None
-    
-    try:
-        with conn.cursor() as cur:
-            cur.execute('''
-                SELECT pdf_data, pdf_filename 
-                FROM assessments 
-                WHERE id = %s AND pdf_data IS NOT NULL
-            ''', (assessment_id,))
-            result = cur.fetchone()
-            if result:
-                return result[0], result[1]
+    with db_connection() as conn:
+        if not conn:
+            return None, None
+        
+        try:
+            with conn.cursor() as cur:
+                cur.execute('''
+                    SELECT b.pdf_data, a.pdf_filename 
+                    FROM report_blobs b
+                    JOIN assessments a ON a.id = b.assessment_id
+                    WHERE b.assessment_id = %s
+                ''', (assessment_id,))
+                result = cur.fetchone()
+                if result:
+                    return result[0], result[1]
+                return None, None
+        except Exception as e:
+            print(f"Error getting PDF by ID: {e}")
             return None, None
-    except Exception as e:
-        print(f"Error getting PDF by ID: {e}")
-        return None, None
-    finally:
-        conn.close()
 
-def get_statistics():
-    """Get comprehensive statistics from PostgreSQL database"""
-    conn = get_db_connection()
-    if not conn:
-        return {
-            'total_assessments': 0,
-            'assessments_by_type': [],
-            'completion_rate': 0
-        }
+def find_report_by_render_hash(render_hash):
+    """Find a stored report with the same render inputs; returns (id, filename)"""
+    with db_connection() as conn:
+        if not conn:
+            return None, None
+        
+        try:
+            with conn.cursor() as cur:
+                cur.execute('''
+                    SELECT id, pdf_filename
+                    FROM assessments
+                    WHERE render_hash = %s AND pdf_filename IS NOT NULL
+                    ORDER BY id DESC
+                    LIMIT 1
+                ''', (render_hash,))
+                result = cur.fetchone()
+                if result:
+                    return result[0], result[1]
+                return None, None
+        except Exception as e:
+            print(f"Error finding report by render hash: {e}")
+            return None, None
+
+def get_pdf_info(assessment_id):
+    """Get PDF filename, size and version (changes when the PDF is replaced) without loading the bytes"""
+    with db_connection() as conn:
+        if not conn:
+            return None, None, None
+        
+        try:
+            with conn.cursor() as cur:
+                cur.execute('''
+                    SELECT a.pdf_filename, b.byte_size,
+                           floor(extract(epoch FROM b.created_at))::bigint
+                    FROM report_blobs b
+                    JOIN assessments a ON a.id = b.assessment_id
+                    WHERE b.assessment_id = %s
+                ''', (assessment_id,))
+                result = cur.fetchone()
+                if result:
+                    return result[0], result[1], result[2]
+                return None, None, None
+        except Exception as e:
+            print(f"Error getting PDF info: {e}")
+            return None, None, None
+
+def iter_pdf_chunks(assessment_id, start, length, chunk_size=PDF_CHUNK_SIZE):
+    """Yield a byte range of a stored PDF in fixed-size chunks"""
+    offset = start
+    end = start + length
     
-    try:
-        with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute('SELECT COUNT(*) as count FROM assessments WHERE completed = true')
-            result = cur.fetchone()
-            total = result['count'] if result else 0
-            
-            cur.execute('SELECT assessment_type, COUNT(*) as count FROM assessments WHERE completed = true GROUP BY assessment_type ORDER BY count DESC')
-            by_type = cur.fetchall()
-            
-            cur.execute('SELECT COUNT(*) as count FROM assessments')
-            total_started_result = cur.fetchone()
-            total_started = total_started_result['count'] if total_started_result else 0
-            
-            completion_rate = (total / total_started * 100) if total_started > 0 else 0
+    while offset < end:
+        size = min(chunk_size, end - offset)
+        # Borrow a connection per chunk so slow clients don't pin the pool
+        with db_connection() as conn:
+            if not conn:
+                print(f"Error streaming PDF {assessment_id}: database unavailable")
+                return
             
-            return {
-                'total_assessments': total,
-                'assessments_by_type': [dict(row) for row in by_type],
-                'completion_rate': round(completion_rate, 2)
-            }
-    except Exception as e:
-        print(f"Error getting statistics: {e}")
+            try:
+                with conn.cursor() as cur:
+                    cur.execute('''
+                        SELECT substring(pdf_data FROM %s FOR %s)
+                        FROM report_blobs
+                        WHERE assessment_id = %s
+                    ''', (offset + 1, size, assessment_id))
+                    result = cur.fetchone()
+            except Exception as e:
+                print(f"Error streaming PDF {assessment_id}: {e}")
+                return
+        
+        if not result or not result[0]:
+            return
+        
+        chunk = bytes(result[0])
+        yield chunk
+        offset += len(chunk)
+
+def backfill_statistics_rollup(cur):
+    """Recompute assessment_stats_daily and assessment_stats_totals from the assessments table"""
+    cur.execute('LOCK TABLE assessments IN SHARE MODE')
+    cur.execute('DELETE FROM assessment_stats_daily')
+    cur.execute('''
+        INSERT INTO assessment_stats_daily (
+            day, assessment_type, language, level_achieved, started_count, completed_count
+        )
+        SELECT COALESCE(timestamp, created_at)::date,
+               COALESCE(assessment_type, ''),
+               COALESCE(language, ''),
+               COALESCE(level_achieved, -1),
+               COUNT(*),
+               COUNT(*) FILTER (WHERE completed)
+        FROM assessments
+        GROUP BY 1, 2, 3, 4
+    ''')
+    print(f"📈 Statistics rollup rebuilt ({cur.rowcount} rows)")
+    cur.execute('DELETE FROM assessment_stats_totals')
+    cur.execute('''
+        INSERT INTO assessment_stats_totals (assessment_type, started_count, completed_count)
+        SELECT assessment_type, SUM(started_count), SUM(completed_count)
+        FROM assessment_stats_daily
+        GROUP BY assessment_type
+    ''')
+
+def rebuild_statistics_rollup():
+    """Rebuild the statistics rollup, e.g. after a manual data fix"""
+    with db_connection() as conn:
+        if not conn:
+            return False
+        
+        try:
+            with conn.cursor() as cur:
+                backfill_statistics_rollup(cur)
+                conn.commit()
+                return True
+        except Exception as e:
+            print(f"Error rebuilding statistics rollup: {e}")
+            conn.rollback()
+            return False
+
+# Last statistics read, served (marked stale) while the database is unavailable
+_last_statistics = None
+
+def last_statistics():
+    """The last statistics this worker read, or empty statistics if it has none"""
+    if _last_statistics is None:
         return {
             'total_assessments': 0,
             'assessments_by_type': [],
             'completion_rate': 0
         }
-    finally:
-        conn.close()
+    return dict(_last_statistics, stale=True)
+
+def get_statistics():
+    """Get comprehensive statistics from PostgreSQL database"""
+    global _last_statistics
+    with db_connection() as conn:
+        if not conn:
+            return last_statistics()
+        
+        from psycopg.rows import dict_row
+        try:
+            with conn.cursor(row_factory=dict_row) as cur:
+                cur.execute('''
+                    SELECT NULLIF(assessment_type, '') as assessment_type,
+                           completed_count as count,
+                           started_count as started
+                    FROM assessment_stats_totals
+                    ORDER BY count DESC
+                ''')
+                rows = cur.fetchall()
+                
+                total = sum(row['count'] for row in rows)
+                total_started = sum(row['started'] for row in rows)
+                by_type = [
+                    {'assessment_type': row['assessment_type'], 'count': row['count']}
+                    for row in rows if row['count'] > 0
+                ]
+                
+                completion_rate = (total / total_started * 100) if total_started > 0 else 0
+                
+                _last_statistics = {
+                    'total_assessments': total,
+                    'assessments_by_type': by_type,
+                    'completion_rate': round(completion_rate, 2)
+                }
+                return _last_statistics
+        except Exception as e:
+            print(f"Error getting statistics: {e}")
+            return last_statistics()
+
+TCP_ANSWER_INSERT = '''
+    INSERT INTO tcp_answers (assessment_id, dimension_name, question_index, score)
+    VALUES (%s, %s, %s, %s)
+'''
+STANDARD_ANSWER_INSERT = '''
+    INSERT INTO assessment_answers (assessment_id, level_number, question_index, answer)
+    VALUES (%s, %s, %s, %s)
+'''
 
-def save_assessment_to_db(assessment_data, answers_data):
-    """Save assessment to database"""
-    conn = get_db_connection()
-    if not conn:
+def insert_assessment(cur, assessment_data):
+    """Insert an assessment, its answer rows and its rollup update on cur.
+    
+    Returns the new id, or None if an assessment with the same
+    idempotency_key was already saved.
+    """
+    assessment_id = insert_assessment_row(cur, assessment_data)
+    if assessment_id is None:
         return None
+
+    # Answer rows go out as one pipelined batch in the same transaction
+    if assessment_data.get('mode') == 'TCP':
+        answer_rows = tcp_answer_rows(assessment_id, assessment_data)
+        if answer_rows:
+            cur.executemany(TCP_ANSWER_INSERT, answer_rows)
+    else:
+        answer_rows = standard_answer_rows(assessment_id, assessment_data)
+        if answer_rows:
+            cur.executemany(STANDARD_ANSWER_INSERT, answer_rows)
+
+    update_statistics_rollup(cur, assessment_id)
+    return assessment_id
+
+def insert_assessment_row(cur, assessment_data):
+    """Insert the assessments row alone; returns its id, or None on an idempotency_key conflict"""
+    cur.execute('''
+        INSERT INTO assessments (
+            session_id, assessment_type, technology_title, description,
+            level_achieved, recommended_pathway, language, timestamp,
+            ip_address, user_agent, consent_given, completed, render_hash,
+            idempotency_key, pdf_filename
+        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ON CONFLICT (idempotency_key) DO NOTHING
+        RETURNING id
+    ''', (
+        assessment_data.get('session_id'),
+        assessment_data.get('mode'),
+        assessment_data.get('technology_title'),
+        assessment_data.get('description'),
+        assessment_data.get('level'),
+        assessment_data.get('recommended_pathway'),
+        assessment_data.get('language'),
+        assessment_data.get('timestamp') or datetime.now().isoformat(),
+        assessment_data.get('ip_address'),
+        assessment_data.get('user_agent'),
+        assessment_data.get('consent_given', True),
+        True,
+        assessment_data.get('render_hash'),
+        assessment_data.get('idempotency_key'),
+        assessment_data.get('pdf_filename')
+    ))
+
+    row = cur.fetchone()
+    return row[0] if row else None
+
+def tcp_answer_rows(assessment_id, assessment_data):
+    """tcp_answers rows: each answer paired with its dimension and question"""
+    tcp_data = assessment_data.get('tcp_data') or {}
+    answers = assessment_data.get('answers') or []
+    answer_rows = []
+    answer_idx = 0
+
+    for dimension in tcp_data.get('dimensions', []):
+        for q_idx, question in enumerate(dimension['questions']):
+            if answer_idx < len(answers):
+                answer_rows.append((assessment_id, dimension['name'], q_idx, answers[answer_idx]))
+                answer_idx += 1
+    return answer_rows
+
+def standard_answer_rows(assessment_id, assessment_data):
+    """assessment_answers rows for a TRL/IRL/MRL assessment"""
+    answers = assessment_data.get('answers') or []
+    return [
+        (assessment_id, level_idx, q_idx, answer)
+        for level_idx, level_answers in enumerate(answers)
+        for q_idx, answer in enumerate(level_answers)
+    ]
+
+def update_statistics_rollup(cur, assessment_id):
+    """Count a newly inserted assessment in the daily rollup and per-type totals"""
+    # Daily rollup and per-type totals move together in one statement
+    cur.execute('''
+        WITH new_row AS (
+            SELECT COALESCE(timestamp, created_at)::date AS day,
+                   COALESCE(assessment_type, '') AS assessment_type,
+                   COALESCE(language, '') AS language,
+                   COALESCE(level_achieved, -1) AS level_achieved,
+                   completed::int AS completed
+            FROM assessments
+            WHERE id = %s
+        ), daily AS (
+            INSERT INTO assessment_stats_daily AS s (
+                day, assessment_type, language, level_achieved, started_count, completed_count
+            )
+            SELECT day, assessment_type, language, level_achieved, 1, completed
+            FROM new_row
+            ON CONFLICT (day, assessment_type, language, level_achieved) DO UPDATE
+            SET started_count = s.started_count + EXCLUDED.started_count,
+                completed_count = s.completed_count + EXCLUDED.completed_count
+        )
+        INSERT INTO assessment_stats_totals AS t (assessment_type, started_count, completed_count)
+        SELECT assessment_type, 1, completed
+        FROM new_row
+        ON CONFLICT (assessment_type) DO UPDATE
+        SET started_count = t.started_count + EXCLUDED.started_count,
+            completed_count = t.completed_count + EXCLUDED.completed_count
+    ''', (assessment_id,))
+
+class ReportRejected(Exception):
+    """Raised when the database refuses a report's data, so retrying can't help"""
+
+def save_report(idempotency_key, assessment_data, filename, pdf_data, email_details=None):
+    """Save an assessment, its PDF and its outbox email in one transaction.
     
-    try:
-        with conn.cursor() as cur:
-            cur.execute('''
-                INSERT INTO assessments (
-                    session_id, assessment_type, technology_title, description,
-                    level_achieved, recommended_pathway, language, timestamp,
-                    ip_address, user_agent, consent_given, completed
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING id
-            ''', (
-                assessment_data.get('session_id'),
-                assessment_data.get('mode'),
-                assessment_data.get('technology_title'),
-                assessment_data.get('description'),
-                assessment_data.get('level'),
-                assessment_data.get('recommended_pathway'),
-                assessment_data.get('language'),
-                assessment_data.get('timestamp'),
-                assessment_data.get('ip_address'),
-                assessment_data.get('user_agent'),
-                assessment_data.get('consent_given', True),
-                True
-            ))
-            
-            assessment_id = cur.fetchone()[0]
-            
-            if assessment_data.get('mode') == 'TCP':
-                tcp_data = assessment_data.get('tcp_data', {})
-                answers = assessment_data.get('answers', [])
-                answer_idx = 0
+    Safe to repeat with the same idempotency_key: a report that was already
+    saved is not saved again and its existing id is returned. Returns None
+    if the database is unavailable or the save failed, and raises
+    ReportRejected if the data itself was refused (a value too long for its
+    column, a constraint violation).
+    """
+    with db_connection() as conn:
+        if not conn:
+            return None
+        
+        from psycopg.errors import DataError, IntegrityError
+        from psycopg.types.json import Jsonb
+        try:
+            with conn.cursor() as cur:
+                # The filename goes in with the row rather than as a follow-up UPDATE
+                assessment_id = insert_assessment(cur, dict(assessment_data, idempotency_key=idempotency_key,
+                                                            pdf_filename=filename))
+                if assessment_id is None:
+                    conn.rollback()
+                    cur.execute('SELECT id FROM assessments WHERE idempotency_key = %s', (idempotency_key,))
+                    assessment_id = cur.fetchone()[0]
+                    print(f"♻️ Report {idempotency_key} already saved as #{assessment_id}")
+                    return assessment_id
                 
-                for dimension in tcp_data.get('dimensions', []):
-                    for q_idx, question in enumerate(dimension['questions']):
-                        if answer_idx < len(answers):
-                            cur.execute('''
-                                INSERT INTO tcp_answers (assessment_id, dimension_name, question_index, score)
-                                VALUES (%s, %s, %s, %s)
-                            ''', (assessment_id, dimension['name'], q_idx, answers[answer_idx]))
-                            answer_idx += 1
-            else:
-                answers = assessment_data.get('answers', [])
-                for level_idx, level_answers in enumerate(answers):
-                    for q_idx, answer in enumerate(level_answers):
-                        cur.execute('''
-                            INSERT INTO assessment_answers (assessment_id, level_number, question_index, answer)
-                            VALUES (%s, %s, %s, %s)
-                        ''', (assessment_id, level_idx, q_idx, answer))
-            
-            conn.commit()
-            return assessment_id
-    except Exception as e:
-        print(f"Error saving assessment: {e}")
-        return None
-    finally:
-        conn.close()
+                insert_pdf_blob(cur, assessment_id, pdf_data)
+                if email_details is not None:
+                    cur.execute('''
+                        INSERT INTO email_outbox (assessment_id, filename, details)
+                        VALUES (%s, %s, %s)
+                    ''', (assessment_id, filename, Jsonb(email_details)))
+                conn.commit()
+                print(f"💾 Report saved: {filename} (#{assessment_id})")
+                return assessment_id
+        except (DataError, IntegrityError) as e:
+            print(f"❌ Report rejected by the database: {e}")
+            raise ReportRejected(str(e)) from e
+        except Exception as e:
+            print(f"Error saving report: {e}")
+            return None
+
+def claim_next_email(lease_seconds):
+    """Lease the next due outbox email (pending, or sending with an expired lease)"""
+    with db_connection() as conn:
+        if not conn:
+            return None
+        
+        from psycopg.rows import dict_row
+        try:
+            with conn.cursor(row_factory=dict_row) as cur:
+                cur.execute('''
+                    WITH claimed AS (
+                        UPDATE email_outbox
+                        SET status = 'sending',
+                            attempts = attempts + 1,
+                            locked_until = CURRENT_TIMESTAMP + make_interval(secs => %s)
+                        WHERE id = (
+                            SELECT id FROM email_outbox
+                            WHERE (status = 'pending' AND next_attempt_at <= CURRENT_TIMESTAMP)
+                               OR (status = 'sending' AND locked_until < CURRENT_TIMESTAMP)
+                            ORDER BY next_attempt_at
+                            LIMIT 1
+                            FOR UPDATE SKIP LOCKED
+                        )
+                        RETURNING id, assessment_id, filename, details, attempts
+                    )
+                    SELECT c.id, c.filename, c.details, c.attempts, b.pdf_data
+                    FROM claimed c
+                    LEFT JOIN report_blobs b ON b.assessment_id = c.assessment_id
+                ''', (lease_seconds,))
+                job = cur.fetchone()
+                conn.commit()
+                return job
+        except Exception as e:
+            print(f"Error claiming email: {e}")
+            return None
+
+def mark_email_sent(outbox_id):
+    """Mark an outbox email as delivered"""
+    with db_connection() as conn:
+        if not conn:
+            return False
+        
+        try:
+            with conn.cursor() as cur:
+                cur.execute('''
+                    UPDATE email_outbox
+                    SET status = 'sent', sent_at = CURRENT_TIMESTAMP,
+                        locked_until = NULL, last_error = NULL
+                    WHERE id = %s
+                ''', (outbox_id,))
+                conn.commit()
+                return True
+        except Exception as e:
+            print(f"Error marking email sent: {e}")
+            return False
+
+def mark_email_failed(outbox_id, error, retry_in_seconds):
+    """Schedule a retry after retry_in_seconds, or dead-letter the email when it is None"""
+    with db_connection() as conn:
+        if not conn:
+            return False
+        
+        try:
+            with conn.cursor() as cur:
+                if retry_in_seconds is None:
+                    cur.execute('''
+                        UPDATE email_outbox
+                        SET status = 'dead', locked_until = NULL, last_error = %s
+                        WHERE id = %s
+                    ''', (error, outbox_id))
+                else:
+                    cur.execute('''
+                        UPDATE email_outbox
+                        SET status = 'pending', locked_until = NULL, last_error = %s,
+                            next_attempt_at = CURRENT_TIMESTAMP + make_interval(secs => %s)
+                        WHERE id = %s
+                    ''', (error, retry_in_seconds, outbox_id))
+                conn.commit()
+                return True
+        except Exception as e:
+            print(f"Error marking email failed: {e}")
+            return False
+
+def create_report_job(payload, request_info):
+    """Queue a report for the render workers; returns the job id"""
+    with db_connection() as conn:
+        if not conn:
+            return None
+        
+        from psycopg.types.json import Jsonb
+        try:
+            with conn.cursor() as cur:
+                job_id = uuid.uuid4()
+                cur.execute('''
+                    INSERT INTO report_jobs (id, payload, request_info)
+                    VALUES (%s, %s, %s)
+                ''', (job_id, Jsonb(payload), Jsonb(request_info)))
+                conn.commit()
+                return job_id
+        except Exception as e:
+            print(f"Error creating report job: {e}")
+            return None
+
+def get_report_job(job_id):
+    """Get report job status (without its payload)"""
+    with db_connection() as conn:
+        if not conn:
+            return None
+        
+        from psycopg.rows import dict_row
+        try:
+            with conn.cursor(row_factory=dict_row) as cur:
+                cur.execute('''
+                    SELECT id, status, assessment_id, attempts, error,
+                           created_at, started_at, finished_at
+                    FROM report_jobs
+                    WHERE id = %s
+                ''', (job_id,))
+                return cur.fetchone()
+        except Exception as e:
+            print(f"Error getting report job: {e}")
+            return None
+
+def claim_report_job(worker, stale_after_seconds):
+    """Claim the oldest queued job (or one whose worker died) with SKIP LOCKED"""
+    with db_connection() as conn:
+        if not conn:
+            return None
+        
+        from psycopg.rows import dict_row
+        try:
+            with conn.cursor(row_factory=dict_row) as cur:
+                cur.execute('''
+                    SELECT id FROM report_jobs
+                    WHERE status = 'queued'
+                       OR (status = 'running'
+                           AND started_at < CURRENT_TIMESTAMP - make_interval(secs => %s))
+                    ORDER BY created_at
+                    LIMIT 1
+                    FOR UPDATE SKIP LOCKED
+                ''', (stale_after_seconds,))
+                row = cur.fetchone()
+                if not row:
+                    conn.commit()
+                    return None
+                
+                cur.execute('''
+                    UPDATE report_jobs
+                    SET status = 'running', worker = %s, attempts = attempts + 1,
+                        started_at = CURRENT_TIMESTAMP
+                    WHERE id = %s
+                    RETURNING id, payload, request_info, attempts
+                ''', (worker, row['id']))
+                job = cur.fetchone()
+                conn.commit()
+                return job
+        except Exception as e:
+            print(f"Error claiming report job: {e}")
+            return None
+
+def finish_report_job(job_id, assessment_id, error=None):
+    """Record a job as done (with its stored assessment) or failed (with an error)"""
+    with db_connection() as conn:
+        if not conn:
+            return False
+        
+        try:
+            with conn.cursor() as cur:
+                cur.execute('''
+                    UPDATE report_jobs
+                    SET status = %s, assessment_id = %s, error = %s,
+                        finished_at = CURRENT_TIMESTAMP
+                    WHERE id = %s
+                ''', ('failed' if error else 'done', assessment_id, error, job_id))
+                conn.commit()
+                return True
+        except Exception as e:
+            print(f"Error finishing report job: {e}")
+            return False
+
+def record_worker_heartbeat(worker, stopping=False):
+    """Mark a report worker as alive, or remove it when it shuts down"""
+    with db_connection() as conn:
+        if not conn:
+            return False
+        
+        try:
+            with conn.cursor() as cur:
+                if stopping:
+                    cur.execute('DELETE FROM report_workers WHERE worker = %s', (worker,))
+                else:
+                    cur.execute('''
+                        INSERT INTO report_workers (worker) VALUES (%s)
+                        ON CONFLICT (worker) DO UPDATE SET last_seen = CURRENT_TIMESTAMP
+                    ''', (worker,))
+                conn.commit()
+                return True
+        except Exception as e:
+            print(f"Error recording worker heartbeat: {e}")
+            return False
+
+def count_live_report_workers(seen_within_seconds):
+    """Report workers that sent a heartbeat recently; None if unknown"""
+    with db_connection() as conn:
+        if not conn:
+            return None
+        
+        try:
+            with conn.cursor() as cur:
+                cur.execute('''
+                    SELECT COUNT(*) FROM report_workers
+                    WHERE last_seen > CURRENT_TIMESTAMP - make_interval(secs => %s)
+                ''', (seen_within_seconds,))
+                return cur.fetchone()[0]
+        except Exception as e:
+            print(f"Error counting report workers: {e}")
+            return None
@@ -0,0 +1,145 @@
+import os
+import threading
+from datetime import datetime
+from database_functions import claim_next_email, mark_email_sent, mark_email_failed
+
+# Assessment fields the email body needs; the rest of the payload is not stored
+EMAIL_DETAIL_FIELDS = ('technology_title', 'mode', 'language', 'level', 'recommended_pathway')
+
+# EMAIL MANAGER
+class EmailManager:
+    def __init__(self):
+        self.smtp_server = os.getenv('SMTP_SERVER', 'smtp.gmail.com')
+        self.smtp_port = int(os.getenv('SMTP_PORT', 587))
+        self.smtp_timeout = float(os.getenv('SMTP_TIMEOUT', 30))
+        self.email_user = os.getenv('EMAIL_USER')
+        self.email_password = os.getenv('EMAIL_PASSWORD')
+        self.admin_email = os.getenv('ADMIN_EMAIL')
+
+    def is_configured(self):
+        return all([self.email_user, self.email_password, self.admin_email])
+
+    def send_pdf_email(self, pdf_buffer, filename, assessment_data):
+        """Send PDF via email to admin"""
+        if not self.is_configured():
+            print("❌ Email configuration incomplete")
+            return False
+
+        try:
+            pdf_buffer.seek(0)
+            self.deliver_pdf_email(pdf_buffer.read(), filename, assessment_data)
+            return True
+        except Exception as e:
+            print(f"❌ Error sending email: {e}")
+            return False
+
+    def deliver_pdf_email(self, pdf_bytes, filename, assessment_data):
+        """Send PDF via email to admin, raising on any SMTP failure"""
+        import smtplib
+        from email.mime.multipart import MIMEMultipart
+        from email.mime.text import MIMEText
+        from email.mime.application import MIMEApplication
+        
+        msg = MIMEMultipart()
+        msg['From'] = self.email_user
+        msg['To'] = self.admin_email
+        msg['Subject'] = f"📊 Assessment Report: {filename}"
+
+        body = f"""
+📊 TECHNOLOGY ASSESSMENT REPORT
+
+📋 Assessment Details:
+• Technology: {assessment_data.get('technology_title', 'N/A')}
+• Assessment Type: {assessment_data.get('mode', 'N/A')}
+• Language: {assessment_data.get('language', 'N/A')}
+• Result: {assessment_data.get('level', assessment_data.get('recommended_pathway', 'N/A'))}
+• Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+
+📎 The complete assessment report is attached.
+
+---
+🏫 MMSU Technology Assessment Tool
+Innovation and Technology Support Office
+        """
+
+        msg.attach(MIMEText(body, 'plain'))
+
+        pdf_attachment = MIMEApplication(pdf_bytes, _subtype='pdf')
+        pdf_attachment.add_header('Content-Disposition', 'attachment', filename=filename)
+        msg.attach(pdf_attachment)
+
+        with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.smtp_timeout) as server:
+            server.starttls()
+            server.login(self.email_user, self.email_password)
+            server.send_message(msg)
+
+        print(f"✅ Email sent successfully to {self.admin_email}")
+
+# EMAIL OUTBOX
+class EmailOutbox:
+    """Persistent email queue drained by a background thread with retries"""
+
+    def __init__(self, email_manager):
+        self.email_manager = email_manager
+        self.poll_interval = float(os.getenv('EMAIL_OUTBOX_POLL_SECONDS', 10))
+        self.lease_seconds = int(os.getenv('EMAIL_OUTBOX_LEASE_SECONDS', 300))
+        self.max_attempts = int(os.getenv('EMAIL_MAX_ATTEMPTS', 6))
+        self.retry_base = float(os.getenv('EMAIL_RETRY_BASE_SECONDS', 30))
+        self.retry_max = float(os.getenv('EMAIL_RETRY_MAX_SECONDS', 3600))
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._thread_pid = None
+
+    def details_for(self, assessment_data):
+        """The stored email fields for an assessment, or None if email isn't configured"""
+        if not self.email_manager.is_configured():
+            print("❌ Email configuration incomplete")
+            return None
+        return {field: assessment_data.get(field) for field in EMAIL_DETAIL_FIELDS}
+
+    def notify(self):
+        """Wake the drain thread after an email was added to the outbox"""
+        self.start()
+        self._wakeup.set()
+
+    def start(self):
+        """Start the drain thread for this process (again after a fork)"""
+        with self._lock:
+            if self._thread and self._thread.is_alive() and self._thread_pid == os.getpid():
+                return
+            self._thread = threading.Thread(target=self._run, name='email-outbox', daemon=True)
+            self._thread_pid = os.getpid()
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                while self.drain_once():
+                    pass
+            except Exception as e:
+                print(f"❌ Email outbox error: {e}")
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def drain_once(self):
+        """Send the next due email; returns False when nothing is due"""
+        job = claim_next_email(self.lease_seconds)
+        if not job:
+            return False
+
+        try:
+            if job['pdf_data'] is None:
+                raise RuntimeError("PDF attachment not found")
+            self.email_manager.deliver_pdf_email(bytes(job['pdf_data']), job['filename'], job['details'])
+        except Exception as e:
+            if job['attempts'] >= self.max_attempts:
+                mark_email_failed(job['id'], str(e), None)
+                print(f"☠️ Email #{job['id']} moved to dead letter after {job['attempts']} attempts: {e}")
+            else:
+                delay = min(self.retry_base * 2 ** (job['attempts'] - 1), self.retry_max)
+                mark_email_failed(job['id'], str(e), delay)
+                print(f"⏳ Email #{job['id']} failed (attempt {job['attempts']}), retrying in {delay:.0f}s: {e}")
+        else:
+            mark_email_sent(job['id'])
+        return True
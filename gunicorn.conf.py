@@ -0,0 +1,19 @@
+"""Gunicorn settings, read automatically from the working directory.
+
+The app is imported once in the master (preload), so the question banks,
+compiled question payloads and scoring tables are built before forking and
+shared copy-on-write by all workers. The master then hands its database
+pool back and freezes the GC so collections in the workers don't write to
+those shared pages.
+"""
+import gc
+
+preload_app = True
+
+def when_ready(server):
+    from database_functions import close_pool
+
+    # Sockets and pool threads must not be inherited; each worker opens its own pool
+    close_pool()
+    gc.collect()
+    gc.freeze()
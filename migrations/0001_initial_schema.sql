@@ -0,0 +1,145 @@
+-- Baseline: the schema init_database() used to create on every boot.
+-- Every statement is idempotent, so databases created before migrations
+-- existed are adopted as version 1 without changes.
+
+CREATE TABLE IF NOT EXISTS assessments (
+    id SERIAL PRIMARY KEY,
+    session_id VARCHAR(255),
+    assessment_type VARCHAR(10),
+    technology_title VARCHAR(500),
+    description TEXT,
+    level_achieved INTEGER,
+    recommended_pathway VARCHAR(100),
+    language VARCHAR(10),
+    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    ip_address INET,
+    user_agent TEXT,
+    consent_given BOOLEAN DEFAULT TRUE,
+    completed BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    pdf_filename VARCHAR(255)
+);
+
+ALTER TABLE assessments ADD COLUMN IF NOT EXISTS pdf_filename VARCHAR(255);
+ALTER TABLE assessments ADD COLUMN IF NOT EXISTS render_hash CHAR(64);
+
+-- PDF bytes live in their own table so assessment scans never touch blob pages
+CREATE TABLE IF NOT EXISTS report_blobs (
+    assessment_id INTEGER PRIMARY KEY REFERENCES assessments(id) ON DELETE CASCADE,
+    pdf_data BYTEA NOT NULL,
+    byte_size INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+-- Keep blobs uncompressed so substring() reads only the TOAST chunks it needs
+ALTER TABLE report_blobs ALTER COLUMN pdf_data SET STORAGE EXTERNAL;
+
+-- Move PDF bytes out of the legacy assessments.pdf_data column
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = current_schema()
+          AND table_name = 'assessments' AND column_name = 'pdf_data'
+    ) THEN
+        INSERT INTO report_blobs (assessment_id, pdf_data, byte_size)
+        SELECT id, pdf_data, octet_length(pdf_data)
+        FROM assessments
+        WHERE pdf_data IS NOT NULL
+        ON CONFLICT (assessment_id) DO NOTHING;
+        ALTER TABLE assessments DROP COLUMN pdf_data;
+    END IF;
+END
+$$;
+
+CREATE TABLE IF NOT EXISTS assessment_answers (
+    id SERIAL PRIMARY KEY,
+    assessment_id INTEGER REFERENCES assessments(id) ON DELETE CASCADE,
+    level_number INTEGER,
+    question_index INTEGER,
+    answer BOOLEAN,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS tcp_answers (
+    id SERIAL PRIMARY KEY,
+    assessment_id INTEGER REFERENCES assessments(id) ON DELETE CASCADE,
+    dimension_name VARCHAR(100),
+    question_index INTEGER,
+    score INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_assessments_timestamp ON assessments(timestamp);
+CREATE INDEX IF NOT EXISTS idx_assessments_type ON assessments(assessment_type);
+
+CREATE INDEX IF NOT EXISTS idx_assessments_render_hash
+ON assessments (render_hash)
+WHERE render_hash IS NOT NULL;
+
+-- Keyset pagination of the PDF archive walks (timestamp, id) newest first
+UPDATE assessments SET timestamp = created_at WHERE timestamp IS NULL;
+CREATE INDEX IF NOT EXISTS idx_assessments_pdf_archive
+ON assessments (timestamp DESC, id DESC)
+WHERE pdf_filename IS NOT NULL;
+
+-- Statistics rollup, maintained in the same transaction as each assessment insert
+CREATE TABLE IF NOT EXISTS assessment_stats_daily (
+    day DATE NOT NULL,
+    assessment_type VARCHAR(10) NOT NULL,
+    language VARCHAR(10) NOT NULL,
+    level_achieved INTEGER NOT NULL,
+    started_count INTEGER NOT NULL DEFAULT 0,
+    completed_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, assessment_type, language, level_achieved)
+);
+
+-- Outbox for report emails, drained by a background sender with retries
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id SERIAL PRIMARY KEY,
+    assessment_id INTEGER REFERENCES assessments(id) ON DELETE SET NULL,
+    filename VARCHAR(255) NOT NULL,
+    details JSONB NOT NULL,
+    pdf_data BYTEA,
+    status VARCHAR(10) NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    locked_until TIMESTAMP,
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    sent_at TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_email_outbox_due
+ON email_outbox (next_attempt_at)
+WHERE status IN ('pending', 'sending');
+
+-- Report jobs, claimed by standalone workers (report_worker.py)
+CREATE TABLE IF NOT EXISTS report_jobs (
+    id UUID PRIMARY KEY,
+    status VARCHAR(10) NOT NULL DEFAULT 'queued',
+    payload JSONB NOT NULL,
+    request_info JSONB,
+    assessment_id INTEGER REFERENCES assessments(id) ON DELETE SET NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker VARCHAR(255),
+    error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_report_jobs_open
+ON report_jobs (created_at)
+WHERE status IN ('queued', 'running');
+
+-- Backfill the rollup for databases that predate it
+INSERT INTO assessment_stats_daily (
+    day, assessment_type, language, level_achieved, started_count, completed_count
+)
+SELECT COALESCE(timestamp, created_at)::date,
+       COALESCE(assessment_type, ''),
+       COALESCE(language, ''),
+       COALESCE(level_achieved, -1),
+       COUNT(*),
+       COUNT(*) FILTER (WHERE completed)
+FROM assessments
+WHERE NOT EXISTS (SELECT 1 FROM assessment_stats_daily)
+GROUP BY 1, 2, 3, 4;
@@ -0,0 +1,9 @@
+-- migrate: no-transaction
+-- Answer rows are looked up and cascade-deleted by assessment_id, which had
+-- no index. Built concurrently so inserts keep flowing on a live database.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_assessment_answers_assessment
+ON assessment_answers (assessment_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tcp_answers_assessment
+ON tcp_answers (assessment_id);
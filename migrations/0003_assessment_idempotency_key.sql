@@ -0,0 +1,8 @@
+-- migrate: no-transaction
+-- Reports replayed from the local spool carry an idempotency key, so a
+-- replay that repeats is saved once (INSERT ... ON CONFLICT DO NOTHING).
+
+ALTER TABLE assessments ADD COLUMN IF NOT EXISTS idempotency_key UUID;
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_assessments_idempotency_key
+ON assessments (idempotency_key);
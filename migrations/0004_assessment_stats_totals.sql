@@ -0,0 +1,15 @@
+-- Running totals per assessment type, kept next to the daily rollup by the
+-- same statement, so statistics read a handful of rows however many days
+-- the rollup covers.
+
+CREATE TABLE IF NOT EXISTS assessment_stats_totals (
+    assessment_type VARCHAR(10) PRIMARY KEY,
+    started_count INTEGER NOT NULL DEFAULT 0,
+    completed_count INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT INTO assessment_stats_totals (assessment_type, started_count, completed_count)
+SELECT assessment_type, SUM(started_count), SUM(completed_count)
+FROM assessment_stats_daily
+WHERE NOT EXISTS (SELECT 1 FROM assessment_stats_totals)
+GROUP BY assessment_type;
@@ -0,0 +1,7 @@
+-- Heartbeats from running report workers, so /api/reports can refuse jobs
+-- that nothing would ever pick up.
+
+CREATE TABLE IF NOT EXISTS report_workers (
+    worker VARCHAR(255) PRIMARY KEY,
+    last_seen TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
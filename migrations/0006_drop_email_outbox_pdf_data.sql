@@ -0,0 +1,5 @@
+-- Outbox emails read their attachment from report_blobs, since the email is
+-- queued in the same transaction that saves the report; the inline copy is
+-- never written.
+
+ALTER TABLE email_outbox DROP COLUMN IF EXISTS pdf_data;
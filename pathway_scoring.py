@@ -0,0 +1,56 @@
+import os
+import json
+import math
+import hashlib
+
+WEIGHTS_PATH = os.getenv('PATHWAY_WEIGHTS_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pathway_weights.json'))
+
+class PathwayScoringEngine:
+    """Commercialization pathway scores as a weight matrix over the TCP dimension sums.
+
+    Each pathway score is weights . dimension_sums + bias, so scoring N
+    assessments is one (N x dimensions) @ (dimensions x pathways) multiply.
+    The weights live in pathway_weights.json so ITSO can tune them without
+    a code change; they may be fractional (the TCP decision table stores
+    whatever scores they produce).
+    """
+
+    def __init__(self, path=WEIGHTS_PATH):
+        with open(path, 'rb') as f:
+            raw = f.read()
+        config = json.loads(raw)
+
+        self.dimensions = tuple(config['dimensions'])
+        self.pathway_names = tuple(pathway['name'] for pathway in config['pathways'])
+        weights = [pathway['weights'] for pathway in config['pathways']]
+        if any(len(row) != len(self.dimensions) for row in weights):
+            raise ValueError(f"{path}: every pathway needs {len(self.dimensions)} weights")
+        biases = [pathway.get('bias', 0) for pathway in config['pathways']]
+        for value in [weight for row in weights for weight in row] + biases:
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+                raise ValueError(f"{path}: weights and biases must be finite numbers, got {value!r}")
+
+        self._weight_rows = weights
+        self._bias_values = biases
+        self._matrices = None
+        self.fingerprint = hashlib.sha256(raw).hexdigest()
+
+    def matrices(self):
+        """(weights, bias) as NumPy arrays; NumPy is loaded on the first score"""
+        if self._matrices is None:
+            import numpy as np
+            # Stored as (dimensions x pathways) so a row of sums multiplies straight through
+            self._matrices = (np.array(self._weight_rows).T, np.array(self._bias_values))
+        return self._matrices
+
+    def score_matrix(self, dimension_sums):
+        """Pathway scores for an (N x dimensions) array of sums, as (N x pathways)"""
+        import numpy as np
+        weights, bias = self.matrices()
+        return np.asarray(dimension_sums) @ weights + bias
+
+    def score(self, dimension_sums):
+        """Pathway name -> score for one assessment"""
+        return dict(zip(self.pathway_names, self.score_matrix([dimension_sums])[0].tolist()))
+
+pathway_engine = PathwayScoringEngine()
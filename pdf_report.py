@@ -0,0 +1,345 @@
+import os
+import io
+import json
+import hashlib
+import threading
+import multiprocessing
+from datetime import datetime, timezone
+
+# Bump when the report layout changes so cached renders are not reused
+REPORT_LAYOUT_VERSION = 2
+
+# Deterministic mode: identical inputs render byte-identical PDFs (fixed metadata,
+# dates from the assessment, document ID derived from the content hash)
+DETERMINISTIC_PDF = os.getenv('PDF_DETERMINISTIC', 'true').lower() in ('1', 'true', 'yes')
+
+class RenderQueueFull(Exception):
+    """Raised when every render worker is busy and the wait queue is full"""
+
+class RenderTimeout(Exception):
+    """Raised when a render job exceeds PDF_RENDER_TIMEOUT"""
+
+def report_timestamp(data):
+    """Assessment time (UTC) shown on the report; now only if the payload has none"""
+    value = data.get('timestamp')
+    if value:
+        try:
+            parsed = datetime.fromisoformat(str(value))
+        except ValueError:
+            parsed = None
+        if parsed is not None:
+            if parsed.tzinfo:
+                parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+            return parsed
+    return datetime.utcnow()
+
+def content_digest(data):
+    """SHA-256 over the whole render payload, used to seed the PDF document ID"""
+    canonical = json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+# PDF GENERATION
+def build_pdf_bytes(data, deterministic=None):
+    """Render the enhanced PDF report and return its bytes (runs in render workers)"""
+    # ReportLab is only loaded where PDFs are rendered, not on web-process import
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib import colors
+    from reportlab.lib.units import inch
+    
+    if deterministic is None:
+        deterministic = DETERMINISTIC_PDF
+    report_time = report_timestamp(data) if deterministic else datetime.utcnow()
+
+    buf = io.BytesIO()
+    # invariant=1 pins CreationDate/ModDate and stops ReportLab seeding the ID with the clock
+    doc = SimpleDocTemplate(
+        buf, pagesize=A4, topMargin=0.5*inch, invariant=1 if deterministic else 0,
+        title="MMSU Technology Assessment Report",
+        author="MMSU Innovation and Technology Support Office",
+        subject=data.get('mode_full', data.get('mode', '')),
+        creator="MMSU Enhanced Technology Assessment Tool"
+    )
+
+    def sign_document(canvas, doc):
+        if deterministic:
+            canvas._doc.updateSignature(content_digest(data))
+    styles = getSampleStyleSheet()
+    
+    title_style = ParagraphStyle("Title", parent=styles["Heading1"], fontSize=16, textColor=colors.darkgreen, alignment=1, spaceAfter=6)
+    subtitle_style = ParagraphStyle("Subtitle", parent=styles["Normal"], fontSize=10, textColor=colors.darkblue, alignment=1, spaceAfter=12)
+    heading_style = ParagraphStyle("Heading", parent=styles["Heading2"], fontSize=12, textColor=colors.darkgreen)
+    
+    elements = []
+    
+    # Header
+    elements.append(Paragraph("MARANO MARCOS STATE UNIVERSITY", title_style))
+    elements.append(Paragraph("Innovation and Technology Support Office", subtitle_style))
+    elements.append(Paragraph("📊 Enhanced Technology Assessment Tool", subtitle_style))
+    elements.append(Spacer(1, 18))
+    
+    elements.append(Paragraph(f"📋 {data.get('mode_full', data['mode'])} Assessment Report", heading_style))
+    elements.append(Spacer(1, 10))
+    
+    # Technology Information
+    tech_info = [
+        ["Technology Title:", data.get('technology_title', 'N/A')],
+        ["Description:", data.get('description', 'N/A')[:100] + "..." if len(data.get('description', '')) > 100 else data.get('description', 'N/A')],
+        ["Assessment Date:", report_time.strftime('%Y-%m-%d %H:%M:%S UTC')],
+        ["Assessment Type:", data.get('mode_full', data['mode'])],
+        ["Language:", data.get('language', 'english').title()]
+    ]
+    
+    if data['mode'] == 'TCP':
+        tech_info.append(["Recommended Pathway:", data.get('recommended_pathway', 'N/A')])
+        detailed_analysis = data.get('detailed_analysis', {})
+        confidence = detailed_analysis.get('confidence_score', 0)
+        tech_info.append(["Confidence Level:", f"{confidence}%"])
+        overall_readiness = detailed_analysis.get('overall_readiness', 'N/A')
+        tech_info.append(["Overall Readiness:", overall_readiness])
+    else:
+        tech_info.append(["Level Achieved:", str(data.get('level', 'N/A'))])
+    
+    tech_table = Table(tech_info, colWidths=[2*inch, 4*inch])
+    tech_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP')
+    ]))
+    
+    elements.append(tech_table)
+    elements.append(Spacer(1, 16))
+    
+    # Assessment Summary
+    elements.append(Paragraph("📊 Assessment Summary", heading_style))
+    explanation_text = data.get("explanation", "No explanation available.")
+    # Clean up explanation text for PDF
+    explanation_text = explanation_text.replace("**", "").replace("*", "")
+    elements.append(Paragraph(explanation_text[:1000] + "..." if len(explanation_text) > 1000 else explanation_text, styles["Normal"]))
+    elements.append(Spacer(1, 14))
+    
+    # Enhanced Analysis Section for TCP
+    if data.get('mode') == 'TCP' and data.get('detailed_analysis'):
+        analysis = data['detailed_analysis']
+        
+        elements.append(Paragraph("🔍 Detailed Analysis", heading_style))
+        
+        # Dimension Analysis
+        if 'dimension_scores' in analysis:
+            elements.append(Paragraph("📋 Dimension Analysis:", styles["Heading3"]))
+            elements.append(Spacer(1, 6))
+            
+            dimension_data = []
+            dimension_data.append(["Dimension", "Score", "Percentage", "Level"])
+            
+            for dim_name, dim_data in analysis['dimension_scores'].items():
+                dimension_data.append([
+                    dim_name,
+                    f"{dim_data['score']}/{dim_data['max_score']}",
+                    f"{dim_data['percentage']}%",
+                    dim_data['level']
+                ])
+            
+            dim_table = Table(dimension_data, colWidths=[2.5*inch, 0.8*inch, 0.8*inch, 0.9*inch])
+            dim_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.darkgreen),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, -1), 8),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+                ('TOPPADDING', (0, 0), (-1, -1), 4),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')
+            ]))
+            
+            elements.append(dim_table)
+            elements.append(Spacer(1, 12))
+        
+        # Key Recommendations
+        if 'recommendations' in analysis:
+            recommendations = analysis['recommendations']
+            elements.append(Paragraph("💡 Key Recommendations:", styles["Heading3"]))
+            
+            if 'immediate_actions' in recommendations and recommendations['immediate_actions']:
+                elements.append(Paragraph("Immediate Actions:", styles["Heading4"]))
+                for i, action in enumerate(recommendations['immediate_actions'][:4], 1):
+                    clean_action = action.replace("🔧", "").replace("📊", "").replace("💼", "").strip()
+                    elements.append(Paragraph(f"{i}. {clean_action}", styles["Normal"]))
+                elements.append(Spacer(1, 8))
+            
+            if 'strategic_priorities' in recommendations and recommendations['strategic_priorities']:
+                elements.append(Paragraph("Strategic Priorities:", styles["Heading4"]))
+                for i, priority in enumerate(recommendations['strategic_priorities'][:4], 1):
+                    clean_priority = priority.replace("🎯", "").replace("📈", "").replace("🤝", "").replace("💰", "").strip()
+                    elements.append(Paragraph(f"{i}. {clean_priority}", styles["Normal"]))
+                elements.append(Spacer(1, 8))
+    
+    # Standard Assessment Results (TRL, IRL, MRL)
+    elif data.get('mode') in ['TRL', 'IRL', 'MRL'] and data.get('questions'):
+        elements.append(Paragraph("📋 Assessment Results", heading_style))
+        
+        if data.get('answers') and data.get('questions'):
+            # Create summary table
+            level_data = [["Level", "Title", "Completion", "Status"]]
+            
+            answers = data.get('answers', [])
+            questions = data.get('questions', [])
+            
+            for idx, (level_answers, question_level) in enumerate(zip(answers, questions)):
+                if idx < len(answers) and idx < len(questions):
+                    yes_count = sum(level_answers) if level_answers else 0
+                    total_count = len(level_answers) if level_answers else 0
+                    completion_rate = (yes_count / total_count * 100) if total_count > 0 else 0
+                    
+                    status = "✓ Complete" if completion_rate == 100 else "~ Partial" if completion_rate > 0 else "✗ Not Started"
+                    
+                    level_data.append([
+                        f"Level {question_level.get('level', idx)}",
+                        question_level.get('title', 'N/A')[:30] + "..." if len(question_level.get('title', '')) > 30 else question_level.get('title', 'N/A'),
+                        f"{completion_rate:.0f}%",
+                        status
+                    ])
+            
+            if len(level_data) > 1:  # Has data beyond header
+                level_table = Table(level_data, colWidths=[0.8*inch, 2.5*inch, 0.8*inch, 1.4*inch])
+                level_table.setStyle(TableStyle([
+                    ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
+                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                    ('FONTSIZE', (0, 0), (-1, -1), 8),
+                    ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+                    ('TOPPADDING', (0, 0), (-1, -1), 4),
+                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')
+                ]))
+                
+                elements.append(level_table)
+                elements.append(Spacer(1, 12))
+    
+    # Footer
+    elements.append(Spacer(1, 20))
+    footer_style = ParagraphStyle("Footer", parent=styles["Normal"], fontSize=8, textColor=colors.grey, alignment=1)
+    elements.append(Paragraph("───────────────────────────────────────────", footer_style))
+    elements.append(Paragraph("📊 Generated by MMSU Enhanced Technology Assessment Tool", footer_style))
+    elements.append(Paragraph("Innovation and Technology Support Office", footer_style))
+    elements.append(Paragraph(f"Report generated on {report_time.strftime('%B %d, %Y at %H:%M UTC')}", footer_style))
+    
+    # Build PDF
+    try:
+        doc.build(elements, onFirstPage=sign_document)
+        print("✅ PDF built successfully")
+    except Exception as e:
+        print(f"❌ Error building PDF: {e}")
+        # Create a simple fallback PDF
+        elements = [
+            Paragraph("MMSU Technology Assessment Report", styles["Title"]),
+            Spacer(1, 12),
+            Paragraph(f"Technology: {data.get('technology_title', 'N/A')}", styles["Normal"]),
+            Paragraph(f"Assessment Type: {data.get('mode', 'N/A')}", styles["Normal"]),
+            Paragraph(f"Result: {data.get('level', data.get('recommended_pathway', 'N/A'))}", styles["Normal"]),
+            Spacer(1, 12),
+            Paragraph("Complete analysis available in the web interface.", styles["Normal"])
+        ]
+        doc.build(elements, onFirstPage=sign_document)
+    
+    return buf.getvalue()
+
+# RENDER POOL
+class RenderWaiter:
+    """A caller waiting on one render; woken by the result, or early if its pool is torn down"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.pool_discarded = False
+
+class PDFRenderPool:
+    """Process pool that keeps ReportLab layout off the request thread"""
+
+    def __init__(self):
+        self.workers = int(os.getenv('PDF_RENDER_WORKERS', 2))
+        self.max_queue = int(os.getenv('PDF_RENDER_QUEUE', 8))
+        self.queue_wait = float(os.getenv('PDF_RENDER_QUEUE_WAIT', 5))
+        self.timeout = float(os.getenv('PDF_RENDER_TIMEOUT', 60))
+        self.max_jobs_per_worker = int(os.getenv('PDF_RENDER_MAX_JOBS', 50))
+        self.start_method = os.getenv('PDF_RENDER_START_METHOD', 'forkserver')
+        # Running plus queued jobs are capped; callers wait briefly, then get RenderQueueFull
+        self._slots = threading.BoundedSemaphore(max(self.workers, 1) + self.max_queue)
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pool_pid = None
+        self._waiters = {}
+
+    def _get_pool(self, waiter=None):
+        """The current pool, started if needed; registers waiter on it in the same step"""
+        with self._lock:
+            if self._pool is None or self._pool_pid != os.getpid():
+                context = multiprocessing.get_context(self.start_method)
+                if self.start_method == 'forkserver':
+                    context.set_forkserver_preload(['pdf_report', 'reportlab.platypus'])
+                # maxtasksperchild recycles workers to cap ReportLab memory growth
+                self._pool = context.Pool(self.workers, maxtasksperchild=self.max_jobs_per_worker)
+                self._pool_pid = os.getpid()
+            if waiter is not None:
+                self._waiters.setdefault(self._pool, set()).add(waiter)
+            return self._pool
+
+    def _discard_pool(self, pool):
+        """Terminate a pool with a hung job unless it was already replaced.
+
+        multiprocessing.Pool can't stop a single task, so the whole pool
+        goes; the other renders on it are lost and their callers are woken
+        at once with RenderTimeout instead of each waiting out its timeout.
+        """
+        with self._lock:
+            if self._pool is not pool:
+                return
+            self._pool = None
+            waiters = self._waiters.pop(pool, ())
+        for waiter in waiters:
+            waiter.pool_discarded = True
+            waiter.done.set()
+        threading.Thread(target=pool.terminate, daemon=True).start()
+
+    def render(self, data):
+        """Render a report in a worker process and return the PDF bytes"""
+        if self.workers <= 0:
+            return build_pdf_bytes(data)
+
+        if not self._slots.acquire(timeout=self.queue_wait):
+            raise RenderQueueFull("PDF render queue is full")
+        try:
+            waiter = RenderWaiter()
+            pool = self._get_pool(waiter)
+            try:
+                result = pool.apply_async(build_pdf_bytes, (data,),
+                                          callback=lambda _: waiter.done.set(),
+                                          error_callback=lambda _: waiter.done.set())
+                if not waiter.done.wait(self.timeout):
+                    self._discard_pool(pool)
+                    raise RenderTimeout(f"PDF render exceeded {self.timeout:.0f}s")
+                if waiter.pool_discarded:
+                    raise RenderTimeout("PDF render pool was restarted after another render timed out")
+                return result.get()
+            finally:
+                with self._lock:
+                    pool_waiters = self._waiters.get(pool)
+                    if pool_waiters is not None:
+                        pool_waiters.discard(waiter)
+                        if not pool_waiters:
+                            del self._waiters[pool]
+        finally:
+            self._slots.release()
+
+render_pool = PDFRenderPool()
+
+def create_enhanced_pdf(data):
+    """Create enhanced PDF report"""
+    return io.BytesIO(render_pool.render(data))
@@ -0,0 +1,133 @@
+import os
+import threading
+from collections import OrderedDict
+from pdf_report import REPORT_LAYOUT_VERSION, content_digest
+from pathway_scoring import pathway_engine
+
+def render_key(data):
+    """SHA-256 of everything the report depends on, used as the cache and dedupe key.
+
+    The whole payload is hashed, since the PDF prints derived fields (level,
+    explanation, analysis, questions) as well as the answers; the layout
+    version and the pathway weights retire old renders when either changes.
+    """
+    return content_digest({
+        'payload': data,
+        'layout_version': REPORT_LAYOUT_VERSION,
+        'pathway_weights': pathway_engine.fingerprint
+    })
+
+class RenderCache:
+    """In-process LRU of rendered PDFs bounded by bytes, with an optional disk tier.
+
+    The disk tier is shared by every process and bounded too: once it grows
+    past PDF_CACHE_DIR_MAX_BYTES the least recently used files are deleted.
+    """
+
+    def __init__(self):
+        self.max_bytes = int(os.getenv('PDF_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+        self.disk_dir = os.getenv('PDF_CACHE_DIR')
+        self.disk_max_bytes = int(os.getenv('PDF_CACHE_DIR_MAX_BYTES', 256 * 1024 * 1024))
+        self._disk_size = None
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            pdf_bytes = self._entries.get(key)
+            if pdf_bytes is not None:
+                self._entries.move_to_end(key)
+                return pdf_bytes
+
+        pdf_bytes = self._read_disk(key)
+        if pdf_bytes is not None:
+            self._remember(key, pdf_bytes)
+        return pdf_bytes
+
+    def put(self, key, pdf_bytes):
+        self._remember(key, pdf_bytes)
+        self._write_disk(key, pdf_bytes)
+
+    def _remember(self, key, pdf_bytes):
+        if len(pdf_bytes) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = pdf_bytes
+            self._size += len(pdf_bytes)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key[:2], f"{key}.pdf")
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                pdf_bytes = f.read()
+            # The modification time doubles as the last-use time for eviction
+            os.utime(path)
+            return pdf_bytes
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            print(f"PDF cache read error: {e}")
+            return None
+
+    def _write_disk(self, key, pdf_bytes):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(pdf_bytes)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"PDF cache write error: {e}")
+            return
+
+        with self._lock:
+            if self._disk_size is not None:
+                self._disk_size += len(pdf_bytes)
+            if self._disk_size is None or self._disk_size > self.disk_max_bytes:
+                self._disk_size = self._evict_disk()
+
+    def _evict_disk(self):
+        """Delete least recently used files until the disk tier fits; returns its size.
+
+        Other processes write to the same directory, so the size is re-read
+        from disk here rather than trusted from this process's count.
+        """
+        files = []
+        for root, _, names in os.walk(self.disk_dir):
+            for name in names:
+                if not name.endswith('.pdf'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        return total
+
+render_cache = RenderCache()
@@ -0,0 +1,81 @@
+"""Standalone report worker: claims queued report jobs and renders them.
+
+Run one or more of these next to the web service (see Procfile). Each
+worker records a heartbeat; /api/reports refuses new jobs while no worker
+is alive, so a deployment without workers (render.yaml on the free plan)
+falls back to /api/generate_pdf instead of queueing jobs forever.
+
+    python report_worker.py
+
+Jobs are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so any number of
+workers can share the queue and rendering scales separately from the web
+workers.
+"""
+import os
+import signal
+import socket
+import time
+import traceback
+from dotenv import load_dotenv
+from database_functions import init_database, claim_report_job, finish_report_job, record_worker_heartbeat
+from email_outbox import EmailManager, EmailOutbox
+from reports import generate_report
+
+load_dotenv()
+
+POLL_SECONDS = float(os.getenv('REPORT_WORKER_POLL_SECONDS', 2))
+STALE_JOB_SECONDS = int(os.getenv('REPORT_JOB_STALE_SECONDS', 600))
+MAX_ATTEMPTS = int(os.getenv('REPORT_JOB_MAX_ATTEMPTS', 3))
+HEARTBEAT_SECONDS = float(os.getenv('REPORT_WORKER_HEARTBEAT_SECONDS', 30))
+
+running = True
+
+def stop(signum, frame):
+    global running
+    print(f"🛑 Report worker stopping (signal {signum})")
+    running = False
+
+def process_job(job, email_outbox):
+    """Render and store one claimed job, recording the outcome on the job row"""
+    job_id = job['id']
+    if job['attempts'] > MAX_ATTEMPTS:
+        finish_report_job(job_id, None, f"Gave up after {MAX_ATTEMPTS} attempts")
+        print(f"☠️ Report job {job_id} abandoned after {MAX_ATTEMPTS} attempts")
+        return
+
+    print(f"📄 Report job {job_id} - Mode: {job['payload'].get('mode', 'Unknown')}")
+    try:
+        buf, filename, assessment_id = generate_report(job['payload'], job['request_info'] or {}, email_outbox)
+        if not assessment_id:
+            raise RuntimeError("Report could not be saved to the database")
+        finish_report_job(job_id, assessment_id)
+        print(f"✅ Report job {job_id} done: {filename}")
+    except Exception as e:
+        traceback.print_exc()
+        finish_report_job(job_id, None, str(e))
+        print(f"❌ Report job {job_id} failed: {e}")
+
+def main():
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    worker_name = f"{socket.gethostname()}:{os.getpid()}"
+    email_outbox = EmailOutbox(EmailManager())
+    init_database()
+    print(f"👷 Report worker {worker_name} started")
+
+    next_heartbeat = 0
+    while running:
+        if time.monotonic() >= next_heartbeat:
+            record_worker_heartbeat(worker_name)
+            next_heartbeat = time.monotonic() + HEARTBEAT_SECONDS
+        job = claim_report_job(worker_name, STALE_JOB_SECONDS)
+        if job:
+            process_job(job, email_outbox)
+        else:
+            time.sleep(POLL_SECONDS)
+
+    record_worker_heartbeat(worker_name, stopping=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import io
+import uuid
+from datetime import datetime
+from database_functions import save_report, find_report_by_render_hash, get_pdf_by_id, ReportRejected
+from pdf_report import create_enhanced_pdf, report_timestamp
+from render_cache import render_cache, render_key
+
+# Column sizes of assessments.technology_title and pdf_filename; longer values would be rejected
+TITLE_MAX_LENGTH = 500
+FILENAME_MAX_LENGTH = 255
+
+def generate_report(data, request_info, email_outbox, spool=None):
+    """Render, store and queue the email for one assessment report.
+
+    Shared by /api/generate_pdf and the standalone report worker. Returns
+    (pdf_buffer, filename, assessment_id). With a spool (see
+    assessment_spool.py) the report is saved in the background and
+    assessment_id is None; without one it is saved here and assessment_id
+    is None if the save failed. An identical submission, however old the
+    first one, is saved under the same idempotency key, so it never adds a
+    second row, blob or email.
+    """
+    # The report shows the assessment time, so it is part of the render inputs.
+    # It comes from the client, so it is only printed; the row gets server time.
+    report_time = report_timestamp(data)
+    data = dict(data, timestamp=report_time.isoformat())
+    render_hash = render_key(data)
+
+    # Spooled writes never wait on the database here; the replayed save
+    # finds an already stored report by its key. Without a spool the save
+    # below needs the database anyway, and a stored report saves a render.
+    if spool is None:
+        existing_id, existing_filename = find_report_by_render_hash(render_hash)
+        if existing_id:
+            pdf_bytes = render_cache.get(render_hash)
+            if pdf_bytes is None:
+                pdf_bytes, _ = get_pdf_by_id(existing_id)
+            if pdf_bytes is not None:
+                render_cache.put(render_hash, bytes(pdf_bytes))
+                print(f"♻️ Reusing stored report #{existing_id}: {existing_filename}")
+                return io.BytesIO(pdf_bytes), existing_filename, existing_id
+
+    # Generate PDF (or reuse an identical render)
+    pdf_bytes = render_cache.get(render_hash)
+    if pdf_bytes is None:
+        pdf_bytes = create_enhanced_pdf(data).getvalue()
+        render_cache.put(render_hash, pdf_bytes)
+    buf = io.BytesIO(pdf_bytes)
+
+    # Generate filename
+    date_str = report_time.strftime('%m%d%y')
+    tech_title = data.get('technology_title', 'Assessment').replace(' ', '_').replace('/', '_')
+    tech_title = tech_title[:FILENAME_MAX_LENGTH - len(f"{date_str}__Report.pdf")]
+    filename = f"{date_str}_{tech_title}_Report.pdf"
+
+    # Save to database
+    assessment_data = {
+        'session_id': data.get('session_id'),
+        'mode': data['mode'],
+        'technology_title': (data.get('technology_title') or '')[:TITLE_MAX_LENGTH] or None,
+        'description': data.get('description'),
+        'level': data.get('level'),
+        'recommended_pathway': data.get('recommended_pathway'),
+        'language': data.get('language', 'english'),
+        'timestamp': datetime.now().isoformat(),
+        'ip_address': request_info.get('ip_address'),
+        'user_agent': request_info.get('user_agent'),
+        'consent_given': data.get('consent_given', True),
+        'tcp_data': data.get('tcp_data'),
+        'answers': data.get('answers'),
+        'render_hash': render_hash
+    }
+
+    record = {
+        'assessment': assessment_data,
+        'filename': filename,
+        'email': email_outbox.details_for(assessment_data)
+    }
+    # Keyed by content, so repeat clicks while the spool waits on the database save once
+    key = str(uuid.UUID(hex=render_hash[:32]))
+    if spool is not None and spool.append(key, record, pdf_bytes):
+        print(f"📝 Report spooled: {filename}")
+        return buf, filename, None
+    
+    try:
+        assessment_id = store_report(key, record, pdf_bytes, email_outbox)
+    except ReportRejected:
+        assessment_id = None
+    if assessment_id is None:
+        # Not saved (database down or data rejected) and nothing spooled: send inline so the report isn't lost
+        email_report(record, pdf_bytes, email_outbox)
+    
+    return buf, filename, assessment_id
+
+def store_report(key, record, pdf_bytes, email_outbox):
+    """Save one report with its outbox email; returns the assessment id or None.
+    
+    Used directly and as the spool's replay function; the key makes a
+    repeated save a no-op. Raises ReportRejected if the database refuses
+    the data, which the spool treats as final.
+    """
+    assessment_id = save_report(key, record['assessment'], record['filename'], pdf_bytes, record['email'])
+    if assessment_id and record['email'] is not None:
+        email_outbox.notify()
+    return assessment_id
+
+def email_report(record, pdf_bytes, email_outbox):
+    """Email a report that couldn't be saved straight to the admin, bypassing the outbox"""
+    if record['email'] is not None:
+        email_outbox.email_manager.send_pdf_email(io.BytesIO(pdf_bytes), record['filename'], record['email'])
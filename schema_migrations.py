@@ -0,0 +1,251 @@
+"""Versioned schema migrations.
+
+Migrations are the numbered .sql files in migrations/ (0001_name.sql,
+0002_name.sql, ...), applied in order and recorded in the schema_version
+table, so each runs exactly once per database. A file normally runs in one
+transaction together with its schema_version row. A file whose first line
+is "-- migrate: no-transaction" runs statement by statement in autocommit
+instead, for online index builds (CREATE INDEX CONCURRENTLY); its
+statements are split on the ";" outside comments, quoted strings and
+identifiers and dollar-quoted bodies, and must be safe to re-run.
+
+The runner holds a session advisory lock, so gunicorn workers, the report
+worker and flask init-db can all call it at once and only one applies
+anything. A dry run applies the pending transactional migrations in one
+transaction, printing how long each took, and rolls them all back.
+"""
+import os
+import re
+import time
+import hashlib
+
+MIGRATIONS_DIR = os.getenv('SCHEMA_MIGRATIONS_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations'))
+MIGRATION_LOCK_KEY = int(os.getenv('SCHEMA_LOCK_KEY', 72_031_701))
+MIGRATION_LOCK_POLL_SECONDS = 0.5
+
+MIGRATION_FILE_PATTERN = re.compile(r'^(\d+)_(\w+)\.sql$')
+NO_TRANSACTION_MARKER = '-- migrate: no-transaction'
+CONCURRENT_INDEX_PATTERN = re.compile(r'CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+IF\s+NOT\s+EXISTS\s+(\w+)', re.IGNORECASE)
+DOLLAR_QUOTE_PATTERN = re.compile(r'\$([A-Za-z_][A-Za-z_0-9]*)?\$')
+
+def split_statements(sql):
+    """Split SQL on top-level semicolons; returns the statements that aren't only comments.
+
+    Follows PostgreSQL's lexical rules for what can hide a ";": -- line
+    comments, nested /* */ comments, 'strings' (E'...' with backslash
+    escapes), "identifiers" and $tag$ dollar-quoted bodies.
+    """
+    statements = []
+    start = 0
+    has_code = False
+    i = 0
+    length = len(sql)
+    while i < length:
+        char = sql[i]
+        if sql.startswith('--', i):
+            end = sql.find('\n', i)
+            i = length if end < 0 else end + 1
+            continue
+        if sql.startswith('/*', i):
+            depth = 1
+            i += 2
+            while i < length and depth:
+                if sql.startswith('/*', i):
+                    depth, i = depth + 1, i + 2
+                elif sql.startswith('*/', i):
+                    depth, i = depth - 1, i + 2
+                else:
+                    i += 1
+            if depth:
+                raise ValueError("Unterminated /* comment */")
+            continue
+
+        has_code = has_code or not char.isspace()
+        if char in ("'", '"'):
+            backslash_escapes = char == "'" and i > 0 and sql[i - 1] in 'eE' and not (i > 1 and (sql[i - 2].isalnum() or sql[i - 2] == '_'))
+            i += 1
+            while True:
+                if i >= length:
+                    raise ValueError(f"Unterminated {char}quoted{char} text")
+                if backslash_escapes and sql[i] == '\\':
+                    i += 2
+                elif sql[i] == char:
+                    # A doubled quote is an escaped quote, not the end
+                    if sql.startswith(char * 2, i):
+                        i += 2
+                    else:
+                        i += 1
+                        break
+                else:
+                    i += 1
+            continue
+        if char == '$' and not (i > 0 and (sql[i - 1].isalnum() or sql[i - 1] in '_$')):
+            match = DOLLAR_QUOTE_PATTERN.match(sql, i)
+            if match:
+                end = sql.find(match.group(0), match.end())
+                if end < 0:
+                    raise ValueError(f"Unterminated {match.group(0)} body")
+                i = end + len(match.group(0))
+                continue
+        if char == ';':
+            if has_code:
+                statements.append(sql[start:i].strip())
+            start, has_code = i + 1, False
+        i += 1
+
+    if has_code:
+        statements.append(sql[start:].strip())
+    return statements
+
+class Migration:
+    """One migration file"""
+
+    def __init__(self, version, name, path):
+        self.version = version
+        self.name = name
+        self.path = path
+        with open(path, encoding='utf-8') as f:
+            self.sql = f.read()
+        self.checksum = hashlib.sha256(self.sql.encode('utf-8')).hexdigest()
+        self.transactional = not self.sql.lstrip().startswith(NO_TRANSACTION_MARKER)
+
+    @property
+    def label(self):
+        return f"{self.version:04d}_{self.name}"
+
+    def statements(self):
+        """Individual statements, for migrations run outside a transaction"""
+        return split_statements(self.sql)
+
+def load_migrations(directory=MIGRATIONS_DIR):
+    """All migrations in version order"""
+    migrations = []
+    for filename in sorted(os.listdir(directory)):
+        match = MIGRATION_FILE_PATTERN.match(filename)
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2), os.path.join(directory, filename)))
+
+    versions = [migration.version for migration in migrations]
+    if len(set(versions)) != len(versions):
+        raise ValueError(f"Duplicate migration versions in {directory}")
+    return migrations
+
+def acquire_lock(conn):
+    """Take the migration lock, polling rather than blocking.
+
+    A session parked inside pg_advisory_lock() is an open transaction, and
+    CREATE INDEX CONCURRENTLY in the session holding the lock would wait
+    for it to finish: a deadlock. Short pg_try_advisory_lock() calls don't.
+    """
+    while not conn.execute('SELECT pg_try_advisory_lock(%s)', (MIGRATION_LOCK_KEY,)).fetchone()[0]:
+        time.sleep(MIGRATION_LOCK_POLL_SECONDS)
+
+def ensure_version_table(conn):
+    with conn.transaction():
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                name VARCHAR(255) NOT NULL,
+                checksum CHAR(64) NOT NULL,
+                duration_ms INTEGER NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+def applied_versions(conn):
+    """{version: checksum} of the migrations this database has applied"""
+    if conn.execute("SELECT to_regclass('schema_version')").fetchone()[0] is None:
+        return {}
+    return dict(conn.execute('SELECT version, checksum FROM schema_version').fetchall())
+
+def drop_invalid_indexes(conn, migration):
+    """Drop indexes a failed concurrent build left behind, so IF NOT EXISTS retries them"""
+    names = CONCURRENT_INDEX_PATTERN.findall(migration.sql)
+    if not names:
+        return
+    invalid = conn.execute('''
+        SELECT c.relname FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE NOT i.indisvalid AND c.relname = ANY(%s)
+          AND c.relnamespace = current_schema()::regnamespace
+    ''', (names,)).fetchall()
+    for (name,) in invalid:
+        print(f"🧹 Dropping invalid index {name} from an interrupted build")
+        conn.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+def record(conn, migration, duration_ms):
+    conn.execute(
+        'INSERT INTO schema_version (version, name, checksum, duration_ms) VALUES (%s, %s, %s, %s)',
+        (migration.version, migration.name, migration.checksum, duration_ms)
+    )
+
+def apply_migration(conn, migration):
+    """Apply one migration and record it; returns the time taken in ms"""
+    start = time.perf_counter()
+    if migration.transactional:
+        with conn.transaction():
+            conn.execute(migration.sql)
+            duration_ms = int((time.perf_counter() - start) * 1000)
+            record(conn, migration, duration_ms)
+        return duration_ms
+
+    drop_invalid_indexes(conn, migration)
+    for statement in migration.statements():
+        conn.execute(statement)
+    duration_ms = int((time.perf_counter() - start) * 1000)
+    with conn.transaction():
+        record(conn, migration, duration_ms)
+    return duration_ms
+
+def rehearse(conn, migrations):
+    """Apply migrations in one transaction, print each one's timing, then roll it all back"""
+    from psycopg import Rollback
+    with conn.transaction():
+        for migration in migrations:
+            if not migration.transactional:
+                print(f"🧪 {migration.label}: runs outside a transaction, not rehearsed")
+                continue
+            start = time.perf_counter()
+            conn.execute(migration.sql)
+            duration_ms = int((time.perf_counter() - start) * 1000)
+            print(f"🧪 {migration.label}: {duration_ms} ms")
+        raise Rollback()
+    print(f"🧪 Dry run rolled back, {len(migrations)} migration(s) pending")
+
+def migrate(conn, dry_run=False, migrations=None):
+    """Bring the schema up to date on conn; returns the migrations applied (or rehearsed).
+
+    The connection is switched to autocommit for the run and restored
+    afterwards. Raises on the first failing migration; the ones before it
+    stay applied.
+    """
+    migrations = load_migrations() if migrations is None else migrations
+    autocommit = conn.autocommit
+    conn.autocommit = True
+    try:
+        acquire_lock(conn)
+        try:
+            if not dry_run:
+                ensure_version_table(conn)
+            applied = applied_versions(conn)
+            for migration in migrations:
+                if migration.version in applied and applied[migration.version] != migration.checksum:
+                    print(f"⚠️ Migration {migration.label} changed after it was applied")
+
+            pending = [migration for migration in migrations if migration.version not in applied]
+            if not pending:
+                print(f"✅ Database schema is up to date (version {max(applied, default=0)})")
+                return []
+
+            if dry_run:
+                rehearse(conn, pending)
+                return pending
+
+            for migration in pending:
+                duration_ms = apply_migration(conn, migration)
+                print(f"✅ Applied migration {migration.label} in {duration_ms} ms")
+            return pending
+        finally:
+            conn.execute('SELECT pg_advisory_unlock(%s)', (MIGRATION_LOCK_KEY,))
+    finally:
+        conn.autocommit = autocommit
@@ -0,0 +1,107 @@
+"""Score a file of completed assessments offline.
+
+    python score_file.py answers.jsonl > results.jsonl
+    python score_file.py answers.csv --output-format csv -o results.csv
+
+Input is JSONL (one /api/assess payload per line) or CSV with the columns
+mode, language, technology_title, description and answers, where answers is
+the JSON answer list. The file is streamed in chunks, each scored as one
+batch, so memory stays flat however large the input is. Uses the same
+scoring core as the web app, without Flask or a database.
+"""
+import sys
+import csv
+import json
+import time
+import argparse
+from itertools import islice
+from scoring import assess_batch
+
+CSV_OUTPUT_FIELDS = ('index', 'mode', 'language', 'technology_title', 'level', 'recommended_pathway', 'error')
+
+def read_jsonl(stream):
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield {"_error": f"Invalid JSON: {e}"}
+
+def read_csv(stream):
+    for row in csv.DictReader(stream):
+        try:
+            row['answers'] = json.loads(row.get('answers') or 'null')
+        except ValueError as e:
+            row = {"_error": f"Invalid answers JSON: {e}"}
+        yield row
+
+def positive_int(value):
+    """argparse type for counts that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+def score_stream(items, chunk_size):
+    """Yield results in input order, scoring chunk_size items at a time"""
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    offset = 0
+    while True:
+        chunk = list(islice(items, chunk_size))
+        if not chunk:
+            return
+        # Unparseable rows keep their slot as an error; the rest are scored together
+        valid = [item for item in chunk if not (isinstance(item, dict) and '_error' in item)]
+        scored = iter(assess_batch(valid))
+        for position, item in enumerate(chunk):
+            if isinstance(item, dict) and '_error' in item:
+                result = {"error": item['_error']}
+            else:
+                result = next(scored)
+            result['index'] = offset + position
+            yield result
+        offset += len(chunk)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a CSV or JSONL file of assessments")
+    parser.add_argument('input', help="input file, or - for stdin")
+    parser.add_argument('-o', '--output', default='-', help="output file (default: stdout)")
+    parser.add_argument('--format', choices=('jsonl', 'csv'), help="input format (default: from the file extension)")
+    parser.add_argument('--output-format', choices=('jsonl', 'csv'), default='jsonl',
+                        help="jsonl writes full results, csv a one-line summary per assessment")
+    parser.add_argument('--chunk-size', type=positive_int, default=1000, help="assessments scored per batch")
+    args = parser.parse_args(argv)
+
+    input_format = args.format or ('csv' if args.input.lower().endswith('.csv') else 'jsonl')
+    source = sys.stdin if args.input == '-' else open(args.input, newline='', encoding='utf-8')
+    target = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+
+    started = time.perf_counter()
+    count = errors = 0
+    try:
+        items = read_csv(source) if input_format == 'csv' else read_jsonl(source)
+        if args.output_format == 'csv':
+            writer = csv.DictWriter(target, fieldnames=CSV_OUTPUT_FIELDS, extrasaction='ignore')
+            writer.writeheader()
+        for result in score_stream(items, args.chunk_size):
+            if args.output_format == 'csv':
+                writer.writerow(result)
+            else:
+                target.write(json.dumps(result, ensure_ascii=False) + "\n")
+            count += 1
+            errors += 'error' in result
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed else 0
+    print(f"✅ Scored {count} assessments ({errors} errors) in {elapsed:.2f}s, {rate:.0f}/s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
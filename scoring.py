@@ -0,0 +1,590 @@
+"""Assessment scoring core: TRL/IRL/MRL levels and TCP pathway analysis.
+
+Plain functions over plain data (dicts and lists in, dicts out), with no
+Flask, ReportLab or database imports, so the web app, the report worker and
+offline tools such as score_file.py share one implementation.
+"""
+import json
+import hashlib
+import inspect
+from datetime import datetime
+from question_data import TRL_QUESTIONS, IRL_QUESTIONS, MRL_QUESTIONS, TCP_QUESTIONS, to_plain
+from pathway_scoring import pathway_engine
+from tcp_table import TCPDecisionTable, TABLE_PATH as TCP_TABLE_PATH
+
+# QUESTION SET VERSIONS
+QUESTION_BANKS = {
+    "TRL": TRL_QUESTIONS,
+    "IRL": IRL_QUESTIONS,
+    "MRL": MRL_QUESTIONS,
+    "TCP": TCP_QUESTIONS
+}
+
+def question_set_version(question_set):
+    """Content-hash version id of one (mode, language) question set"""
+    canonical = json.dumps(to_plain(question_set), sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+# (mode, language) -> version, and version -> (mode, language, question set)
+QUESTION_SET_IDS = {}
+QUESTION_SETS_BY_VERSION = {}
+for _mode, _bank in QUESTION_BANKS.items():
+    for _language, _question_set in _bank.items():
+        _version = question_set_version(_question_set)
+        QUESTION_SET_IDS[(_mode, _language)] = _version
+        QUESTION_SETS_BY_VERSION[_version] = (_mode, _language, _question_set)
+
+def resolve_question_set(data):
+    """Fill in the question set a lean assessment result refers to.
+
+    Returns the payload with questions (or tcp_data for TCP) taken from the
+    server's copy of the versioned set, the payload unchanged if it has no
+    version (full responses from older clients), or None if the version is
+    unknown, e.g. the questions changed since the assessment was taken.
+    """
+    version = data.get('question_set_version')
+    if not version:
+        return data
+    entry = QUESTION_SETS_BY_VERSION.get(version)
+    if entry is None:
+        return None
+    mode, language, question_set = entry
+    resolved = dict(data, mode=mode, language=language)
+    if mode == "TCP":
+        resolved['tcp_data'] = to_plain(question_set)
+    else:
+        resolved['questions'] = to_plain(question_set)
+    return resolved
+
+def get_mode_full_name(mode):
+    mode_names = {
+        "TRL": "Technology Readiness Level",
+        "IRL": "Investment Readiness Level", 
+        "MRL": "Market Readiness Level",
+        "TCP": "Technology Commercialization Pathway"
+    }
+    return mode_names.get(mode.upper(), mode)
+
+# ASSESSMENT FUNCTIONS
+def assess(data):
+    """Score one assessment of any mode and return the result dict"""
+    if data["mode"].upper() == "TCP":
+        return assess_tcp_enhanced(data)
+    return assess_standard(data)
+
+def assess_standard(data):
+    """Score a TRL/IRL/MRL assessment; raises ValueError for an unknown mode"""
+    mode = data["mode"]
+    language = data["language"]
+    answers = data["answers"]
+
+    if mode.upper() == "TRL":
+        questions = TRL_QUESTIONS[language.lower()]
+    elif mode.upper() == "IRL":
+        questions = IRL_QUESTIONS[language.lower()]
+    elif mode.upper() == "MRL":
+        questions = MRL_QUESTIONS[language.lower()]
+    else:  
+        raise ValueError("Invalid assessment mode")
+
+    # Number of leading levels whose checks all passed indexes the precomputed outcome
+    passed = 0
+    for level_answers in answers[:len(questions)]:
+        if not all(level_answers):
+            break
+        passed += 1
+    outcome = EXPLANATION_TABLE[(mode.upper(), language.lower())][passed]
+
+    result = standard_result(data, outcome, datetime.utcnow().isoformat())
+    if not data.get("lean"):
+        result["questions"] = to_plain(questions)
+    return result
+
+def standard_result(data, outcome, timestamp):
+    """Lean TRL/IRL/MRL result for a precomputed outcome"""
+    mode = data["mode"]
+    language = data["language"].lower()
+    return {
+        "mode": mode,
+        "mode_full": get_mode_full_name(mode),
+        "level": outcome["level"],
+        "technology_title": data["technology_title"],
+        "description": data["description"],
+        "language": language,
+        "answers": data["answers"],
+        "question_set_version": QUESTION_SET_IDS[(mode.upper(), language)],
+        "explanation": outcome["explanation"],
+        "timestamp": timestamp
+    }
+
+def assess_tcp_enhanced(data):
+    """Enhanced TCP assessment"""
+    language = data["language"].lower()
+    answers = data["answers"]
+    tcp_data = TCP_QUESTIONS[language]
+    technology_title = data["technology_title"]
+    technology_description = data["description"]
+    
+    # Ensure we have exactly 15 answers
+    if len(answers) < 15:
+        answers = answers + [1] * (15 - len(answers))
+    elif len(answers) > 15:
+        answers = answers[:15]
+    
+    # Outcomes depend only on the dimension sums, so look them up in the precomputed table
+    dimension_sums = tcp_dimension_sums(answers, tcp_data)
+    decision = tcp_decision_table.lookup(dimension_sums)
+    if decision:
+        pathway_scores, recommended_pathway, overall_readiness, confidence_score = decision
+        dimension_scores = calculate_dimension_scores(dimension_sums, tcp_data)
+        detailed_analysis = {
+            "dimension_scores": dimension_scores,
+            "recommendations": generate_tcp_recommendations(dimension_scores, recommended_pathway, language),
+            "overall_readiness": overall_readiness,
+            "confidence_score": confidence_score
+        }
+    else:
+        # Calculate pathway scores
+        pathway_scores = calculate_pathway_scores(answers, tcp_data)
+        recommended_pathway = max(pathway_scores, key=pathway_scores.get)
+        
+        # Generate detailed analysis
+        detailed_analysis = generate_tcp_analysis(answers, tcp_data, pathway_scores, recommended_pathway, language)
+    
+    result = tcp_result(data, answers, pathway_scores, recommended_pathway, detailed_analysis, datetime.utcnow().isoformat())
+    if not data.get("lean"):
+        result["tcp_data"] = to_plain(tcp_data)
+    return result
+
+def tcp_result(data, answers, pathway_scores, recommended_pathway, detailed_analysis, timestamp):
+    """Lean TCP result from computed scores and analysis"""
+    language = data["language"].lower()
+    return {
+        "mode": "TCP",
+        "mode_full": "Technology Commercialization Pathway (Enhanced)",
+        "technology_title": data["technology_title"],
+        "description": data["description"],
+        "language": language,
+        "answers": answers,
+        "question_set_version": QUESTION_SET_IDS[("TCP", language)],
+        "pathway_scores": pathway_scores,
+        "recommended_pathway": recommended_pathway,
+        "explanation": generate_tcp_explanation(pathway_scores, recommended_pathway, detailed_analysis, language),
+        "detailed_analysis": detailed_analysis,
+        "timestamp": timestamp,
+        "level": None,
+        "questions": None,
+        "enhanced": True
+    }
+
+def calculate_pathway_scores(answers, tcp_data):
+    """Calculate scores for each commercialization pathway"""
+    pathways = {pathway["name"]: 0 for pathway in tcp_data["pathways"]}
+    
+    # Weighted dimension sums; the formulas live in pathway_weights.json
+    scores = pathway_engine.score(tcp_dimension_sums(answers, tcp_data))
+    for name in pathways:
+        pathways[name] = scores.get(name, 0)
+    
+    return pathways
+
+def tcp_dimension_sums(answers, tcp_data):
+    """Sum of the answers in each TCP dimension, in dimension order"""
+    sums = []
+    answer_idx = 0
+    for dimension in tcp_data["dimensions"]:
+        sums.append(sum(answers[answer_idx:answer_idx + len(dimension["questions"])]))
+        answer_idx += len(dimension["questions"])
+    return tuple(sums)
+
+def calculate_dimension_scores(dimension_sums, tcp_data):
+    """Score, percentage and High/Medium/Low level per dimension"""
+    dimension_scores = {}
+    
+    for dimension, dim_score in zip(tcp_data["dimensions"], dimension_sums):
+        max_score = len(dimension["questions"]) * 3
+        percentage = (dim_score / max_score) * 100
+        
+        dimension_scores[dimension["name"]] = {
+            "score": dim_score,
+            "max_score": max_score,
+            "percentage": round(percentage, 1),
+            "level": "High" if percentage >= 75 else "Medium" if percentage >= 50 else "Low"
+        }
+    
+    return dimension_scores
+
+def generate_tcp_analysis(answers, tcp_data, pathway_scores, recommended_pathway, language):
+    """Generate comprehensive TCP analysis"""
+    dimension_scores = calculate_dimension_scores(tcp_dimension_sums(answers, tcp_data), tcp_data)
+    
+    # Generate comprehensive recommendations
+    recommendations = generate_tcp_recommendations(dimension_scores, recommended_pathway, language)
+    
+    return {
+        "dimension_scores": dimension_scores,
+        "recommendations": recommendations,
+        "overall_readiness": calculate_overall_readiness(dimension_scores),
+        "confidence_score": calculate_confidence_score(pathway_scores, dimension_scores)
+    }
+
+def generate_tcp_recommendations(dimension_scores, recommended_pathway, language):
+    """Generate detailed recommendations based on analysis"""
+    recommendations = {
+        "immediate_actions": [],
+        "strategic_priorities": [],
+        "success_factors": [],
+        "risk_mitigation": []
+    }
+    
+    weak_dimensions = [dim for dim, data in dimension_scores.items() if data["percentage"] < 50]
+    strong_dimensions = [dim for dim, data in dimension_scores.items() if data["percentage"] >= 75]
+    
+    if language == "filipino":
+        # Immediate actions for weak areas
+        for dim in weak_dimensions[:2]:
+            if "Technology" in dim:
+                recommendations["immediate_actions"].append(f"🔧 Palakasin ang technology development para sa {dim}")
+            elif "Market" in dim:
+                recommendations["immediate_actions"].append(f"📊 Mag-conduct ng market research para sa {dim}")
+            elif "Business" in dim:
+                recommendations["immediate_actions"].append(f"💼 Mag-develop ng business capabilities para sa {dim}")
+        
+        # Strategic priorities
+        recommendations["strategic_priorities"] = [
+            f"🎯 Focus sa {recommended_pathway} pathway implementation",
+            "📈 Build comprehensive commercialization strategy",
+            "🤝 Establish key strategic partnerships",
+            "💰 Secure adequate funding and resources"
+        ]
+        
+        # Success factors
+        recommendations["success_factors"] = [
+            "💪 Strong team with complementary skills",
+            "📊 Clear understanding ng market needs",
+            "🔧 Robust technology development process",
+            "💰 Adequate financial resources"
+        ]
+        
+        # Risk mitigation
+        recommendations["risk_mitigation"] = [
+            "⚠️ Monitor market changes at competitive threats",
+            "🛡️ Develop contingency plans para sa key risks",
+            "📊 Establish performance monitoring systems",
+            "🔄 Regular strategy review at adjustment"
+        ]
+    else:
+        # Immediate actions for weak areas
+        for dim in weak_dimensions[:2]:
+            if "Technology" in dim:
+                recommendations["immediate_actions"].append(f"🔧 Strengthen technology development capabilities in {dim}")
+            elif "Market" in dim:
+                recommendations["immediate_actions"].append(f"📊 Conduct comprehensive market research for {dim}")
+            elif "Business" in dim:
+                recommendations["immediate_actions"].append(f"💼 Develop business capabilities for {dim}")
+        
+        # Strategic priorities
+        recommendations["strategic_priorities"] = [
+            f"🎯 Focus on {recommended_pathway} pathway implementation",
+            "📈 Build comprehensive commercialization strategy",
+            "🤝 Establish key strategic partnerships and alliances",
+            "💰 Secure adequate funding and resource commitments"
+        ]
+        
+        # Success factors
+        recommendations["success_factors"] = [
+            "💪 Strong, experienced team with complementary skills",
+            "📊 Clear understanding of market needs and customer requirements",
+            "🔧 Robust technology development and validation process",
+            "💰 Adequate financial resources and funding access"
+        ]
+        
+        # Risk mitigation
+        recommendations["risk_mitigation"] = [
+            "⚠️ Monitor market changes and competitive threats continuously",
+            "🛡️ Develop comprehensive contingency plans for key risks",
+            "📊 Establish performance monitoring and tracking systems",
+            "🔄 Regular strategy review and adjustment processes"
+        ]
+    
+    return recommendations
+
+def calculate_overall_readiness(dimension_scores):
+    """Calculate overall readiness score"""
+    total_percentage = sum(dim["percentage"] for dim in dimension_scores.values())
+    avg_percentage = total_percentage / len(dimension_scores) if dimension_scores else 0
+    
+    if avg_percentage >= 85:
+        return "Excellent"
+    elif avg_percentage >= 70:
+        return "Very Good"
+    elif avg_percentage >= 55:
+        return "Good"
+    elif avg_percentage >= 40:
+        return "Fair"
+    else:
+        return "Needs Development"
+
+def calculate_confidence_score(pathway_scores, dimension_scores):
+    """Calculate confidence score for recommendation"""
+    max_score = max(pathway_scores.values()) if pathway_scores else 0
+    second_score = sorted(pathway_scores.values(), reverse=True)[1] if len(pathway_scores) > 1 else 0
+    score_gap = max_score - second_score
+    
+    avg_dimension_score = sum(dim["percentage"] for dim in dimension_scores.values()) / len(dimension_scores) if dimension_scores else 0
+    
+    confidence = min(100, (score_gap * 10) + (avg_dimension_score * 0.5))
+    return round(confidence, 1)
+
+def generate_enhanced_explanation(level_achieved, mode, language, questions):
+    """Generate enhanced explanation with detailed insights"""
+    if language == "filipino":
+        if level_achieved < (0 if mode == "TRL" else 1):
+            start_level = 0 if mode == "TRL" else 1
+            text = f"🔍 **Assessment Result**: Hindi pa naaabot ng inyong teknolohiya ang antas {start_level} ng {mode}.\n\n"
+            text += f"**📊 Interpretation**: Ang teknolohiya ay nasa napakaunang yugto pa at kailangan ng substantial development.\n\n"
+            text += f"**🚀 Next Steps**: Mag-focus sa fundamental research at basic validation activities."
+        else:
+            current_level = next((q for q in questions if q["level"] == level_achieved), None)
+            if current_level:
+                text = f"🎯 **Assessment Result**: Naabot ng inyong teknolohiya ang {mode} Level {level_achieved} - {current_level['title']}.\n\n"
+                text += f"**📊 Interpretation**: Successfully na-complete ang requirements para sa level na ito.\n\n"
+                
+                # Find next level
+                next_level = next((q for q in questions if q["level"] > level_achieved), None)
+                if next_level:
+                    text += f"**🎯 Next Target**: Para umusad sa Level {next_level['level']} ({next_level['title']}), focus sa:\n"
+                    for req in next_level['checks'][:3]:
+                        text += f"• {req}\n"
+                else:
+                    text += f"**🏆 Congratulations**: Nakamit na ang highest level! Focus sa continuous improvement."
+            else:
+                text = f"Naabot ng teknolohiya ang {mode} level {level_achieved}."
+        
+        return text
+    else:
+        start_level = 0 if mode == "TRL" else 1
+        if level_achieved < start_level:
+            text = f"🔍 **Assessment Result**: Your technology has not yet satisfied the basic requirements for {mode} level {start_level}.\n\n"
+            text += f"**📊 Interpretation**: The technology is in very early stages requiring substantial development.\n\n"
+            text += f"**🚀 Next Steps**: Focus on fundamental research and basic validation activities."
+        else:
+            current_level = next((q for q in questions if q["level"] == level_achieved), None)
+            if current_level:
+                text = f"🎯 **Assessment Result**: Your technology has achieved {mode} Level {level_achieved} - {current_level['title']}.\n\n"
+                text += f"**📊 Interpretation**: Successfully completed requirements for this level.\n\n"
+                
+                # Find next level
+                next_level = next((q for q in questions if q["level"] > level_achieved), None)
+                if next_level:
+                    text += f"**🎯 Next Target**: To advance to Level {next_level['level']} ({next_level['title']}), focus on:\n"
+                    for req in next_level['checks'][:3]:
+                        text += f"• {req}\n"
+                else:
+                    text += f"**🏆 Congratulations**: Achieved the highest level! Focus on continuous improvement."
+            else:
+                text = f"Your technology has achieved {mode} level {level_achieved}."
+        
+        return text
+
+# PRECOMPUTED EXPLANATIONS
+def build_explanation_table(mode, language, questions):
+    """Outcome for every possible number of passed levels (0..len(questions))"""
+    start_level = 0 if mode == "TRL" else 1
+    table = []
+    for passed in range(len(questions) + 1):
+        level_achieved = questions[passed - 1]["level"] if passed else -1
+        table.append({
+            "level_achieved": level_achieved,
+            "level": max(start_level, level_achieved),
+            "explanation": generate_enhanced_explanation(level_achieved, mode, language, questions)
+        })
+    return tuple(table)
+
+# (mode, language) -> outcomes indexed by passed-level count, built once at startup
+EXPLANATION_TABLE = {
+    (mode, language): build_explanation_table(mode, language, questions)
+    for mode in ("TRL", "IRL", "MRL")
+    for language, questions in QUESTION_BANKS[mode].items()
+}
+
+def generate_tcp_explanation(pathway_scores, recommended_pathway, detailed_analysis, language):
+    """Generate enhanced TCP explanation"""
+    confidence = detailed_analysis.get("confidence_score", 0)
+    overall_readiness = detailed_analysis.get("overall_readiness", "Good")
+    
+    if language == "filipino":
+        text = f"📊 **Enhanced Technology Commercialization Analysis**\n\n"
+        text += f"Batay sa comprehensive assessment, ang **pinakarekomendadong pathway** para sa inyong teknolohiya ay ang **{recommended_pathway}** (confidence: {confidence}%).\n\n"
+        text += f"**Overall Readiness:** {overall_readiness}\n\n"
+        text += f"Ang analysis na ito ay nag-evaluate ng inyong teknolohiya sa six critical dimensions upang magbigay ng data-driven recommendation."
+    else:
+        text = f"📊 **Enhanced Technology Commercialization Analysis**\n\n"
+        text += f"Based on comprehensive multi-dimensional assessment, the **most recommended commercialization pathway** for your technology is **{recommended_pathway}** (confidence: {confidence}%).\n\n"
+        text += f"**Overall Readiness:** {overall_readiness}\n\n"
+        text += f"This analysis evaluates your technology across six critical dimensions to provide data-driven recommendations for successful commercialization."
+    
+    return text
+
+# TCP DECISION TABLE
+TCP_DIMENSION_SIZES = tuple(len(dimension["questions"]) for dimension in TCP_QUESTIONS["english"]["dimensions"])
+TCP_PATHWAY_NAMES = tuple(pathway["name"] for pathway in TCP_QUESTIONS["english"]["pathways"])
+# The names pathway_weights.json gives the TCP dimensions, in question order
+TCP_DIMENSION_KEYS = ("technology", "market", "business", "regulatory", "team", "strategic")
+
+def check_pathway_engine(engine):
+    """Raise ValueError unless the engine's weights line up with the TCP question data"""
+    if engine.dimensions != TCP_DIMENSION_KEYS:
+        raise ValueError(f"Pathway weights list dimensions {engine.dimensions}, expected {TCP_DIMENSION_KEYS}")
+    missing = set(TCP_PATHWAY_NAMES) - set(engine.pathway_names)
+    if missing:
+        raise ValueError(f"Pathway weights have no row for {sorted(missing)}")
+
+check_pathway_engine(pathway_engine)
+
+def tcp_scoring_source_hash():
+    """Fingerprint of the scoring code the decision table was generated from"""
+    digest = hashlib.sha256()
+    for func in (tcp_dimension_sums, calculate_dimension_scores, calculate_pathway_scores,
+                 generate_tcp_analysis, calculate_overall_readiness, calculate_confidence_score):
+        digest.update(inspect.getsource(func).encode('utf-8'))
+    digest.update(pathway_engine.fingerprint.encode('utf-8'))
+    return digest.hexdigest()
+
+def decide_tcp_state(dimension_sums):
+    """Score one point of the dimension-sum space with the scoring functions"""
+    tcp_data = TCP_QUESTIONS["english"]
+    # Any answers with these sums score identically; spread each sum over 1-3 ratings
+    answers = []
+    for dim_score, size in zip(dimension_sums, TCP_DIMENSION_SIZES):
+        ratings = [1] * size
+        extra = dim_score - size
+        for idx in range(size):
+            step = min(2, extra)
+            ratings[idx] += step
+            extra -= step
+        answers.extend(ratings)
+    
+    pathway_scores = calculate_pathway_scores(answers, tcp_data)
+    recommended_pathway = max(pathway_scores, key=pathway_scores.get)
+    analysis = generate_tcp_analysis(answers, tcp_data, pathway_scores, recommended_pathway, "english")
+    return pathway_scores, recommended_pathway, analysis["overall_readiness"], analysis["confidence_score"]
+
+tcp_decision_table = TCPDecisionTable(TCP_TABLE_PATH, tcp_scoring_source_hash(), TCP_DIMENSION_SIZES, TCP_PATHWAY_NAMES)
+
+# BATCH ASSESSMENT
+BATCH_REQUIRED_FIELDS = ("mode", "language", "technology_title", "description", "answers")
+
+def validate_batch_item(item):
+    """(mode, language) of a well-formed batch item; raises ValueError otherwise"""
+    if not isinstance(item, dict):
+        raise ValueError("Assessment must be an object")
+    for field in BATCH_REQUIRED_FIELDS:
+        if field not in item:
+            raise ValueError(f"Missing field: {field}")
+    if not isinstance(item["mode"], str) or not isinstance(item["language"], str):
+        raise ValueError("mode and language must be strings")
+    mode, language = item["mode"].upper(), item["language"].lower()
+    if mode not in QUESTION_BANKS:
+        raise ValueError("Invalid assessment mode")
+    if language not in QUESTION_BANKS[mode]:
+        raise ValueError(f"Unsupported language: {item['language']}")
+    if not isinstance(item["answers"], list):
+        raise ValueError("answers must be a list")
+    return mode, language
+
+def score_standard_batch(mode, language, items, timestamp):
+    """Score TRL/IRL/MRL items of one question set as a level-passed boolean matrix"""
+    import numpy as np
+    level_count = len(QUESTION_BANKS[mode][language])
+    outcomes = EXPLANATION_TABLE[(mode, language)]
+    # The trailing always-False column makes argmin land on level_count when every level passed
+    passed_matrix = np.zeros((len(items), level_count + 1), dtype=bool)
+    results = [None] * len(items)
+    for row, (index, item) in enumerate(items):
+        try:
+            level_answers = item["answers"][:level_count]
+            passed_matrix[row, :len(level_answers)] = [all(checks) for checks in level_answers]
+        except TypeError:
+            results[row] = {"index": index, "error": "answers must be a list of check lists"}
+    
+    # First failing level == number of leading levels passed
+    passed_counts = passed_matrix.argmin(axis=1).tolist()
+    for row, (index, item) in enumerate(items):
+        if results[row] is None:
+            results[row] = dict(standard_result(item, outcomes[passed_counts[row]], timestamp), index=index)
+    return results
+
+def score_tcp_batch(language, items, timestamp):
+    """Score TCP items of one language as a dimension-sum matrix"""
+    import numpy as np
+    tcp_data = TCP_QUESTIONS[language]
+    answer_count = sum(TCP_DIMENSION_SIZES)
+    boundaries = np.cumsum((0,) + TCP_DIMENSION_SIZES[:-1])
+    
+    results = [None] * len(items)
+    rows = []
+    for row, (index, item) in enumerate(items):
+        answers = item["answers"]
+        if not all(isinstance(answer, (int, float)) and abs(answer) <= 1e6 for answer in answers):
+            results[row] = {"index": index, "error": "TCP answers must be finite numbers"}
+            continue
+        # Same padding and truncation as assess_tcp_enhanced
+        answers = answers[:answer_count] + [1] * (answer_count - len(answers))
+        rows.append((row, index, item, answers))
+    
+    # Integer and fractional answers are scored separately so int results stay ints
+    for is_integer in (True, False):
+        group = [entry for entry in rows if all(type(answer) is not float for answer in entry[3]) == is_integer]
+        if not group:
+            continue
+        answer_matrix = np.array([entry[3] for entry in group], dtype=np.int64 if is_integer else np.float64)
+        sum_matrix = np.add.reduceat(answer_matrix, boundaries, axis=1)
+        engine_scores = pathway_engine.score_matrix(sum_matrix)
+        # Fractional weights make float scores even from integer answers
+        score_matrix = np.zeros((len(group), len(TCP_PATHWAY_NAMES)), dtype=np.result_type(answer_matrix, engine_scores))
+        for column, name in enumerate(TCP_PATHWAY_NAMES):
+            if name in pathway_engine.pathway_names:
+                score_matrix[:, column] = engine_scores[:, pathway_engine.pathway_names.index(name)]
+        # argmax keeps the first of tied pathways, like max() over the ordered dict
+        recommended = score_matrix.argmax(axis=1).tolist()
+        
+        for (row, index, item, answers), sums, scores, best in zip(group, sum_matrix.tolist(), score_matrix.tolist(), recommended):
+            pathway_scores = dict(zip(TCP_PATHWAY_NAMES, scores))
+            recommended_pathway = TCP_PATHWAY_NAMES[best]
+            dimension_scores = calculate_dimension_scores(sums, tcp_data)
+            detailed_analysis = {
+                "dimension_scores": dimension_scores,
+                "recommendations": generate_tcp_recommendations(dimension_scores, recommended_pathway, language),
+                "overall_readiness": calculate_overall_readiness(dimension_scores),
+                "confidence_score": calculate_confidence_score(pathway_scores, dimension_scores)
+            }
+            results[row] = dict(tcp_result(item, answers, pathway_scores, recommended_pathway, detailed_analysis, timestamp), index=index)
+    return results
+
+def assess_batch(items):
+    """Score many assessments of any mode; results are lean and in input order.
+
+    Items are grouped by question set and each group is scored as one
+    matrix. A malformed item gets {"index", "error"} in its slot instead
+    of failing the batch.
+    """
+    timestamp = datetime.utcnow().isoformat()
+    results = [None] * len(items)
+    groups = {}
+    for index, item in enumerate(items):
+        try:
+            mode, language = validate_batch_item(item)
+        except ValueError as e:
+            results[index] = {"index": index, "error": str(e)}
+            continue
+        groups.setdefault((mode, language), []).append((index, item))
+    
+    for (mode, language), group in groups.items():
+        if mode == "TCP":
+            scored = score_tcp_batch(language, group, timestamp)
+        else:
+            scored = score_standard_batch(mode, language, group, timestamp)
+        for (index, _), result in zip(group, scored):
+            results[index] = result
+    return results
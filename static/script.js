@@ -108,7 +108,9 @@ class AssessmentApp {
 
     async fetchQuestions() {
         try {
-            const res = await fetch(`/api/questions/${this.mode}/${this.lang}`);
+            // Prefer the versioned, immutable URL the page was rendered with
+            const versionedUrl = (window.QUESTION_URLS || {})[`${this.mode}/${this.lang}`];
+            const res = await fetch(versionedUrl || `/api/questions/${this.mode}/${this.lang}`);
             if (!res.ok) {
                 throw new Error(`HTTP error! status: ${res.status}`);
             }
@@ -186,7 +188,9 @@ class AssessmentApp {
             language: this.lang,
             technology_title: this.title,
             description: this.desc,
-            answers: this.tcpAnswers
+            answers: this.tcpAnswers,
+            // Server returns the question set by version instead of echoing it
+            lean: true
         };
 
         console.log("Finishing TCP assessment with payload:", payload);
@@ -344,7 +348,9 @@ class AssessmentApp {
             language: this.lang,
             technology_title: this.title,
             description: this.desc,
-            answers: this.answers
+            answers: this.answers,
+            // Server returns the question set by version instead of echoing it
+            lean: true
         };
 
         try {
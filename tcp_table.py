@@ -0,0 +1,169 @@
+import os
+import sys
+import json
+import zlib
+import itertools
+import threading
+from array import array
+
+TABLE_MAGIC = b"TCPT1\n"
+TABLE_PATH = os.getenv('TCP_TABLE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tcp_decision_table.bin'))
+
+# Every TCP answer is a 1-3 rating, so a dimension of n questions sums to n..3n
+MIN_ANSWER = 1
+MAX_ANSWER = 3
+
+READINESS_LABELS = ("Excellent", "Very Good", "Good", "Fair", "Needs Development")
+
+# Integer scores are packed into the smallest signed type that holds them all;
+# fractional scores (from fractional pathway weights) are stored as doubles
+INTEGER_SCORE_TYPES = ('b', 'h', 'q')
+FLOAT_SCORE_TYPE = 'd'
+
+def score_typecode(values):
+    """Array typecode that stores every pathway score exactly"""
+    if all(isinstance(value, int) for value in values):
+        low, high = min(values, default=0), max(values, default=0)
+        for typecode in INTEGER_SCORE_TYPES:
+            limit = 1 << (array(typecode).itemsize * 8 - 1)
+            if -limit <= low and high < limit:
+                return typecode
+        raise ValueError(f"Pathway scores {low}..{high} don't fit in 64 bits")
+    return FLOAT_SCORE_TYPE
+
+def state_ranges(dimension_sizes):
+    """(lowest sum, number of possible sums) for each dimension"""
+    return tuple((size * MIN_ANSWER, size * (MAX_ANSWER - MIN_ANSWER) + 1) for size in dimension_sizes)
+
+def iter_states(dimension_sizes):
+    """All dimension-sum tuples in table order"""
+    return itertools.product(*(range(low, low + count) for low, count in state_ranges(dimension_sizes)))
+
+def write_table(path, source_hash, dimension_sizes, pathway_names, decide):
+    """Evaluate decide(sums) over the whole state space and write the packed table.
+
+    decide returns (pathway_scores, recommended_pathway, overall_readiness,
+    confidence_score) for one tuple of dimension sums.
+    """
+    scores = []
+    recommended = array('B')
+    readiness = array('B')
+    confidence = array('H')
+    for sums in iter_states(dimension_sizes):
+        pathway_scores, recommended_pathway, overall_readiness, confidence_score = decide(sums)
+        scores.extend(pathway_scores[name] for name in pathway_names)
+        recommended.append(pathway_names.index(recommended_pathway))
+        readiness.append(READINESS_LABELS.index(overall_readiness))
+        # Confidence is rounded to one decimal, so tenths store it exactly
+        confidence.append(int(round(confidence_score * 10)))
+
+    scores = array(score_typecode(scores), scores)
+
+    header = {
+        'source_hash': source_hash,
+        'score_type': scores.typecode,
+        'dimension_sizes': list(dimension_sizes),
+        'pathways': list(pathway_names),
+        'states': len(recommended),
+        'byteorder': sys.byteorder
+    }
+    body = scores.tobytes() + recommended.tobytes() + readiness.tobytes() + confidence.tobytes()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(TABLE_MAGIC)
+        f.write(json.dumps(header, sort_keys=True).encode('utf-8') + b"\n")
+        f.write(zlib.compress(body, 9))
+    os.replace(tmp_path, path)
+    return len(recommended)
+
+class TCPDecisionTable:
+    """Precomputed TCP outcome for every combination of dimension sums.
+
+    Pathway scores, recommendation, readiness and confidence depend only on
+    the six dimension sums, so the whole space is generated offline
+    (flask build-tcp-table) and answered with one index computation. The
+    table is loaded lazily and ignored when missing or built from different
+    scoring code, in which case callers compute the outcome directly.
+    """
+
+    def __init__(self, path, source_hash, dimension_sizes, pathway_names):
+        self.path = path
+        self.source_hash = source_hash
+        self.dimension_sizes = tuple(dimension_sizes)
+        self.pathway_names = tuple(pathway_names)
+        self.ranges = state_ranges(self.dimension_sizes)
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._tables = None
+
+    def _load(self):
+        with self._lock:
+            if self._loaded:
+                return self._tables
+            self._loaded = True
+            try:
+                with open(self.path, 'rb') as f:
+                    if f.readline() != TABLE_MAGIC:
+                        raise ValueError("not a TCP decision table")
+                    header = json.loads(f.readline())
+                    body = zlib.decompress(f.read())
+            except FileNotFoundError:
+                print(f"⚠️ TCP decision table not found at {self.path}, scoring directly (run: flask build-tcp-table)")
+                return None
+            except (OSError, ValueError, zlib.error) as e:
+                print(f"⚠️ TCP decision table unreadable ({e}), scoring directly")
+                return None
+
+            if (header.get('source_hash') != self.source_hash
+                    or tuple(header.get('dimension_sizes', ())) != self.dimension_sizes
+                    or tuple(header.get('pathways', ())) != self.pathway_names
+                    or header.get('score_type', 'b') not in INTEGER_SCORE_TYPES + (FLOAT_SCORE_TYPE,)):
+                print("⚠️ TCP decision table is stale, scoring directly (run: flask build-tcp-table)")
+                return None
+
+            states = header['states']
+            pathway_count = len(self.pathway_names)
+            scores = array(header.get('score_type', 'b'))
+            recommended, readiness, confidence = array('B'), array('B'), array('H')
+            offset = 0
+            for table, count in ((scores, states * pathway_count), (recommended, states), (readiness, states), (confidence, states)):
+                size = count * table.itemsize
+                table.frombytes(body[offset:offset + size])
+                offset += size
+                if header['byteorder'] != sys.byteorder:
+                    table.byteswap()
+
+            self._tables = (scores, recommended, readiness, confidence)
+            print(f"✅ TCP decision table loaded ({states} states)")
+            return self._tables
+
+    def state_index(self, sums):
+        """Row of the table for these dimension sums, or None if outside the space"""
+        index = 0
+        for total, (low, count) in zip(sums, self.ranges):
+            if not isinstance(total, int) or not low <= total < low + count:
+                return None
+            index = index * count + (total - low)
+        return index
+
+    def lookup(self, sums):
+        """(pathway_scores, recommended_pathway, overall_readiness, confidence_score) or None"""
+        tables = self._tables if self._loaded else self._load()
+        if tables is None:
+            return None
+        index = self.state_index(sums)
+        if index is None:
+            return None
+
+        scores, recommended, readiness, confidence = tables
+        pathway_count = len(self.pathway_names)
+        row = scores[index * pathway_count:(index + 1) * pathway_count]
+        pathway_scores = dict(zip(self.pathway_names, row))
+        # calculate_confidence_score caps at the int 100, which renders as "100%" not "100.0%"
+        confidence_score = 100 if confidence[index] == 1000 else confidence[index] / 10
+        return (
+            pathway_scores,
+            self.pathway_names[recommended[index]],
+            READINESS_LABELS[readiness[index]],
+            confidence_score
+        )
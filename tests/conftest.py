@@ -0,0 +1,31 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture(scope='session')
+def database():
+    """An initialized database, or skip when DATABASE_* isn't set up"""
+    import database_functions
+    if database_functions.connection_kwargs() is None:
+        pytest.skip("database not configured")
+    try:
+        database_functions.probe_database()
+    except Exception as e:
+        pytest.skip(f"database unavailable: {e}")
+    assert database_functions.init_database()
+    return database_functions
+
+@pytest.fixture(scope='session')
+def app_module(tmp_path_factory):
+    """The app module, with its report spool in a temporary file instead of the repo"""
+    import app
+    from assessment_spool import AssessmentSpool
+    original = app.assessment_spool
+    app.assessment_spool = AssessmentSpool(
+        str(tmp_path_factory.mktemp('spool') / 'spool.db'), original.save, original.on_dead
+    )
+    yield app
+    app.assessment_spool = original
@@ -0,0 +1,185 @@
+"""Spooled reports the database won't take are dead-lettered, not retried forever."""
+import sqlite3
+import uuid
+
+from assessment_spool import AssessmentSpool
+
+def make_spool(tmp_path, save, on_dead=None):
+    spool = AssessmentSpool(str(tmp_path / 'spool.db'), save, on_dead)
+    spool.retry_base = 0
+    spool.max_attempts = 3
+    # No background replayer; the tests drive replay_once themselves
+    spool.start = lambda: None
+    return spool
+
+def test_rejected_entry_goes_dead_and_the_next_one_saves(tmp_path):
+    saved, dead = [], []
+
+    def save(key, record, pdf_bytes):
+        if record['bad']:
+            raise ValueError("value too long for type character varying(255)")
+        saved.append(key)
+        return 1
+
+    spool = make_spool(tmp_path, save, lambda *entry: dead.append(entry))
+    spool.append('bad', {'bad': True}, b'%PDF-bad')
+    spool.append('good', {'bad': False}, b'%PDF-good')
+
+    while spool.replay_once():
+        pass
+
+    assert saved == ['good']
+    assert dead == [('bad', {'bad': True}, b'%PDF-bad', "value too long for type character varying(255)")]
+    assert spool.stats()['pending'] == 0
+    assert spool.stats()['dead'] == 1
+    assert not spool.replay_once()
+
+def test_unsaved_entry_goes_dead_after_max_attempts(tmp_path):
+    dead = []
+    spool = make_spool(tmp_path, lambda key, record, pdf_bytes: None, lambda *entry: dead.append(entry[0]))
+    spool.append('outage', {}, b'%PDF-')
+
+    for _ in range(spool.max_attempts):
+        assert not spool.replay_once()
+
+    assert dead == ['outage']
+    assert spool.stats() | {'oldest_age_seconds': 0} == {'pending': 0, 'retrying': 0, 'dead': 1, 'oldest_age_seconds': 0}
+
+def test_spool_files_without_dead_column_are_upgraded(tmp_path):
+    conn = sqlite3.connect(tmp_path / 'spool.db')
+    conn.execute('''
+        CREATE TABLE spool (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            idempotency_key TEXT NOT NULL UNIQUE,
+            record TEXT NOT NULL,
+            pdf_data BLOB,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at REAL NOT NULL,
+            created_at REAL NOT NULL
+        )
+    ''')
+    conn.execute("INSERT INTO spool (idempotency_key, record, next_attempt_at, created_at) VALUES ('old', '{}', 0, 0)")
+    conn.commit()
+    conn.close()
+
+    saved = []
+    spool = make_spool(tmp_path, lambda key, record, pdf_bytes: saved.append(key) or 1)
+    assert spool.replay_once()
+    assert saved == ['old']
+
+def test_overlong_title_is_saved_truncated(database, tmp_path):
+    from email_outbox import EmailManager, EmailOutbox
+    from reports import generate_report, store_report
+
+    outbox = EmailOutbox(EmailManager())
+    outbox.email_manager.email_user = None
+    spool = make_spool(tmp_path, lambda key, record, pdf_bytes: store_report(key, record, pdf_bytes, outbox))
+    title = f"Long {uuid.uuid4().hex} " + 'x' * 600
+    data = {'mode': 'TRL', 'language': 'english', 'technology_title': title, 'description': 'd',
+            'answers': [[True] * 5], 'level': 1, 'timestamp': '2026-01-01T00:00:00'}
+
+    _, filename, _ = generate_report(data, {}, outbox, spool)
+    assert spool.replay_once()
+
+    assert len(filename) == 255
+    with database.db_connection() as conn:
+        stored_title, stored_filename = conn.execute(
+            'SELECT technology_title, pdf_filename FROM assessments WHERE technology_title LIKE %s',
+            (title[:40] + '%',)
+        ).fetchone()
+    assert stored_title == title[:500]
+    assert stored_filename == filename
+
+def test_rejected_report_is_emailed_directly(database, app_module, tmp_path, monkeypatch):
+    app = app_module
+
+    sent = []
+    monkeypatch.setattr(app.email_manager, 'send_pdf_email', lambda buf, filename, details: sent.append(filename) or True)
+    for field in ('email_user', 'email_password', 'admin_email'):
+        monkeypatch.setattr(app.email_manager, field, 'itso@example.com')
+    spool = AssessmentSpool(str(tmp_path / 'spool.db'), app.assessment_spool.save, app.assessment_spool.on_dead)
+    spool.start = lambda: None
+    data = {'mode': 'TRL', 'language': 'english', 'technology_title': f"Rejected {uuid.uuid4().hex}",
+            'description': 'd', 'answers': [[True] * 5], 'level': 1, 'timestamp': '2026-01-01T00:00:00',
+            # Longer than assessments.session_id VARCHAR(255)
+            'session_id': 's' * 300}
+
+    _, filename, _ = app.generate_report(data, {}, app.email_outbox, spool)
+    assert spool.replay_once()
+
+    assert sent == [filename]
+    assert spool.stats()['dead'] == 1
+
+def test_same_key_is_spooled_once_and_dead_entries_revive(tmp_path):
+    dead = []
+    spool = make_spool(tmp_path, lambda key, record, pdf_bytes: None, lambda *entry: dead.append(entry[0]))
+    spool.append('same', {}, b'%PDF-')
+    spool.append('same', {}, b'%PDF-')
+    assert spool.stats()['pending'] == 1
+
+    for _ in range(spool.max_attempts):
+        spool.replay_once()
+    assert dead == ['same']
+
+    spool.append('same', {}, b'%PDF-')
+    assert spool.stats() | {'oldest_age_seconds': 0} == {'pending': 1, 'retrying': 0, 'dead': 0, 'oldest_age_seconds': 0}
+
+def test_repeat_downloads_during_an_outage_save_one_report(database, tmp_path):
+    from email_outbox import EmailManager, EmailOutbox
+    from reports import generate_report, store_report
+
+    outbox = EmailOutbox(EmailManager())
+    outbox.email_manager.email_user = None
+    spool = make_spool(tmp_path, lambda key, record, pdf_bytes: store_report(key, record, pdf_bytes, outbox))
+    title = f"Repeat {uuid.uuid4().hex}"
+    data = {'mode': 'TRL', 'language': 'english', 'technology_title': title, 'description': 'd',
+            'answers': [[True] * 5], 'level': 1, 'timestamp': '2026-01-01T00:00:00'}
+
+    # Nothing is replayed between the clicks, as while the database is down
+    for _ in range(3):
+        generate_report(data, {}, outbox, spool)
+    assert spool.stats()['pending'] == 1
+
+    assert spool.replay_once()
+    generate_report(data, {}, outbox, spool)
+    while spool.replay_once():
+        pass
+
+    with database.db_connection() as conn:
+        count = conn.execute('SELECT COUNT(*) FROM assessments WHERE technology_title = %s', (title,)).fetchone()[0]
+    assert count == 1
+
+def test_spooled_report_does_not_query_the_database(tmp_path, monkeypatch):
+    import reports
+    from email_outbox import EmailManager, EmailOutbox
+
+    def no_database(*args):
+        raise AssertionError("database queried on the spooled request path")
+
+    monkeypatch.setattr(reports, 'find_report_by_render_hash', no_database)
+    monkeypatch.setattr(reports, 'get_pdf_by_id', no_database)
+    outbox = EmailOutbox(EmailManager())
+    outbox.email_manager.email_user = None
+    spool = make_spool(tmp_path, lambda key, record, pdf_bytes: 1)
+    data = {'mode': 'TRL', 'language': 'english', 'technology_title': f"Spooled {uuid.uuid4().hex}",
+            'description': 'd', 'answers': [[True] * 5], 'level': 1, 'timestamp': '2026-01-01T00:00:00'}
+
+    _, filename, assessment_id = reports.generate_report(data, {}, outbox, spool)
+
+    assert assessment_id is None
+    assert filename.endswith('_Report.pdf')
+    assert spool.stats()['pending'] == 1
+
+def test_dead_entries_are_purged_after_the_retention(tmp_path):
+    spool = make_spool(tmp_path, lambda key, record, pdf_bytes: None)
+    spool.append('dead', {}, b'%PDF-dead')
+    for _ in range(spool.max_attempts):
+        spool.replay_once()
+    spool.append('pending', {}, b'%PDF-pending')
+
+    assert spool.purge_dead() == 0
+    assert spool.stats()['dead'] == 1
+
+    spool.dead_retention = 0
+    assert spool.purge_dead() == 1
+    assert spool.stats() | {'oldest_age_seconds': 0} == {'pending': 1, 'retrying': 0, 'dead': 0, 'oldest_age_seconds': 0}
@@ -0,0 +1,43 @@
+"""Batch scoring returns exactly what /api/assess returns for each item."""
+import json
+
+import pytest
+
+import scoring
+from pathway_scoring import WEIGHTS_PATH, PathwayScoringEngine
+
+ITEMS = [
+    {'mode': 'TCP', 'language': language, 'technology_title': 'Solar dryer', 'description': 'Batch parity',
+     'answers': answers, 'lean': True}
+    for language in ('english', 'Filipino', 'ENGLISH')
+    for answers in ([3] * 15, [1, 2, 3] * 5, [2] * 10, [2.5] * 15)
+] + [
+    {'mode': 'trl', 'language': 'Filipino', 'technology_title': 'Sensor', 'description': 'Batch parity',
+     'answers': [[True] * 5, [True] * 4, [False]], 'lean': True}
+]
+
+def without_timestamps(result):
+    return {key: value for key, value in result.items() if key not in ('timestamp', 'index')}
+
+def assert_batch_matches_single():
+    for item, batch_result in zip(ITEMS, scoring.assess_batch(ITEMS)):
+        assert without_timestamps(batch_result) == without_timestamps(scoring.assess(item)), item
+
+def test_batch_matches_single_assessments():
+    assert_batch_matches_single()
+
+def test_batch_keeps_fractional_weight_scores(tmp_path, monkeypatch):
+    with open(WEIGHTS_PATH) as f:
+        config = json.load(f)
+    config['pathways'][0]['weights'][0] = 1.5
+    config['pathways'][1]['bias'] = 6.5
+    path = tmp_path / 'weights.json'
+    path.write_text(json.dumps(config))
+    monkeypatch.setattr(scoring, 'pathway_engine', PathwayScoringEngine(str(path)))
+    # The committed table was built from the shipped weights
+    monkeypatch.setattr(scoring.tcp_decision_table, 'lookup', lambda sums: None)
+
+    assert_batch_matches_single()
+    scores = scoring.assess_batch(ITEMS[:1])[0]['pathway_scores']
+    assert scores['Direct Sale'] == pytest.approx(31.5)
+    assert scores['Licensing'] == pytest.approx(21.5)
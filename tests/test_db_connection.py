@@ -0,0 +1,36 @@
+"""Only failures to reach the database count against the circuit breaker, not a busy pool."""
+import pytest
+
+import database_functions
+from circuit_breaker import CircuitBreaker, CLOSED, OPEN
+
+@pytest.fixture
+def breaker(monkeypatch):
+    breaker = CircuitBreaker('test-database', failure_threshold=2, reset_timeout=60)
+    monkeypatch.setattr(database_functions, 'db_breaker', breaker)
+    return breaker
+
+def failed_checkouts(times):
+    for _ in range(times):
+        with database_functions.db_connection() as conn:
+            assert conn is None
+
+def test_exhausted_pool_does_not_trip_breaker(database, breaker, monkeypatch):
+    from psycopg_pool import ConnectionPool
+    before = database_functions.get_pool_stats()['checkout_exhausted']
+    with ConnectionPool(kwargs=database.connection_kwargs(), min_size=1, max_size=1, timeout=0.2) as pool:
+        monkeypatch.setattr(database_functions, 'get_pool', lambda: pool)
+        with database_functions.db_connection() as held:
+            assert held is not None
+            failed_checkouts(3)
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()['consecutive_failures'] == 0
+    assert database_functions.get_pool_stats()['checkout_exhausted'] == before + 3
+
+def test_unreachable_database_trips_breaker(breaker, monkeypatch):
+    from psycopg_pool import ConnectionPool
+    conninfo = 'host=127.0.0.1 port=1 dbname=none user=none connect_timeout=1'
+    with ConnectionPool(conninfo, min_size=1, max_size=2, timeout=0.2) as pool:
+        monkeypatch.setattr(database_functions, 'get_pool', lambda: pool)
+        failed_checkouts(2)
+    assert breaker.state == OPEN
@@ -0,0 +1,100 @@
+"""Report emails go through the outbox: a slow or failing SMTP server must
+not show up in /api/generate_pdf latency, and failures are retried, then
+dead-lettered. smtplib.SMTP is replaced by a stand-in with a set delay."""
+import time
+import uuid
+import smtplib
+
+import pytest
+
+SMTP_DELAY = 3
+
+class StandInSMTP:
+    delay = SMTP_DELAY
+    fail = False
+    sent = []
+
+    def __init__(self, host, port, timeout=None):
+        time.sleep(self.delay)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def starttls(self):
+        pass
+
+    def login(self, user, password):
+        pass
+
+    def send_message(self, msg):
+        if self.fail:
+            raise smtplib.SMTPDataError(554, b"rejected by stand-in")
+        StandInSMTP.sent.append(msg['Subject'])
+
+@pytest.fixture(scope='module')
+def client(database, app_module):
+    app = app_module
+
+    manager = app.email_manager
+    manager.email_user, manager.email_password, manager.admin_email = 'itso@example.com', 'secret', 'admin@example.com'
+    app.email_outbox.poll_interval = 0.2
+    app.email_outbox.retry_base = 0
+    app.email_outbox.max_attempts = 2
+    return app.app.test_client()
+
+@pytest.fixture(autouse=True)
+def stand_in_smtp(monkeypatch):
+    monkeypatch.setattr(smtplib, 'SMTP', StandInSMTP)
+    StandInSMTP.fail = False
+    return StandInSMTP
+
+def post_report(client):
+    title = f"Outbox {uuid.uuid4().hex[:8]}"
+    result = client.post('/api/assess', json={
+        'mode': 'TRL', 'language': 'english', 'technology_title': title,
+        'description': 'SMTP stand-in', 'answers': [[True] * 5, [True] * 4, [True, False]]
+    }).get_json()
+    start = time.perf_counter()
+    response = client.post('/api/generate_pdf', json=result)
+    return response, time.perf_counter() - start, title.replace(' ', '_')
+
+def wait_for(condition, timeout=20):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        value = condition()
+        if value:
+            return value
+        time.sleep(0.1)
+    return condition()
+
+def outbox_row(database, title):
+    with database.db_connection() as conn:
+        return conn.execute(
+            "SELECT status, attempts, last_error FROM email_outbox WHERE filename LIKE %s",
+            (f"%{title}%",)
+        ).fetchone()
+
+def test_pdf_latency_does_not_wait_for_smtp(client, stand_in_smtp):
+    response, elapsed, title = post_report(client)
+
+    assert response.status_code == 200
+    assert response.data.startswith(b'%PDF-')
+    assert elapsed < SMTP_DELAY
+    assert wait_for(lambda: any(title in subject for subject in stand_in_smtp.sent))
+
+def test_failing_email_is_retried_then_dead_lettered(client, database, stand_in_smtp):
+    stand_in_smtp.fail = True
+    stand_in_smtp.delay = 0
+    try:
+        response, _, title = post_report(client)
+        assert response.status_code == 200
+
+        row = wait_for(lambda: (outbox_row(database, title) or (None,))[0] == 'dead' and outbox_row(database, title))
+        assert row[0] == 'dead'
+        assert row[1] == 2
+        assert 'rejected by stand-in' in row[2]
+    finally:
+        stand_in_smtp.delay = SMTP_DELAY
@@ -0,0 +1,43 @@
+"""Importing app stays cheap: heavy subsystems load on first use, not at import.
+
+Every gunicorn worker (and the report worker) pays the import on start, so
+the budget is checked in a fresh interpreter with -X importtime.
+"""
+import os
+import sys
+import subprocess
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_BUDGET_MS = float(os.getenv('IMPORT_BUDGET_MS', 600))
+DEFERRED_MODULES = ('reportlab', 'PIL', 'psycopg', 'psycopg_pool', 'numpy', 'smtplib', 'email.mime')
+
+CHECK = f"import sys, app; print('loaded:', *(name for name in {DEFERRED_MODULES!r} if name in sys.modules))"
+
+@pytest.fixture(scope='module')
+def app_import():
+    """(stdout, stderr) of importing app in a new interpreter"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHECK],
+        cwd=REPO_ROOT, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    return result.stdout, result.stderr
+
+def import_time_ms(stderr, module):
+    """Cumulative import time of a top-level module from -X importtime output"""
+    for line in stderr.splitlines():
+        if line.startswith('import time:') and line.rsplit('|', 1)[-1].rstrip() == f' {module}':
+            return int(line.split('|')[1]) / 1000
+    raise AssertionError(f"{module} not in -X importtime output")
+
+def test_app_import_within_budget(app_import):
+    _, stderr = app_import
+    elapsed_ms = import_time_ms(stderr, 'app')
+    assert elapsed_ms <= IMPORT_BUDGET_MS, f"import app took {elapsed_ms:.0f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)"
+
+def test_heavy_modules_not_imported(app_import):
+    stdout, _ = app_import
+    loaded = [line for line in stdout.splitlines() if line.startswith('loaded:')][-1].split()[1:]
+    assert loaded == []
@@ -0,0 +1,49 @@
+"""The shipped pathway_weights.json reproduces the original hand-written pathway formulas."""
+import json
+
+import pytest
+
+from pathway_scoring import WEIGHTS_PATH, PathwayScoringEngine, pathway_engine
+from scoring import TCP_DIMENSION_KEYS, TCP_DIMENSION_SIZES, TCP_PATHWAY_NAMES, check_pathway_engine
+from tcp_table import iter_states
+
+def original_pathway_scores(sums):
+    """calculate_pathway_scores as it was written before the weights file"""
+    tech_score, market_score, business_score, regulatory_score, team_score, strategic_score = sums
+    return {
+        "Direct Sale": tech_score + business_score + market_score,
+        "Licensing": tech_score + market_score + (6 - business_score) + regulatory_score,
+        "Startup/Spin-out": tech_score + team_score + market_score + strategic_score,
+        "Assignment": tech_score + (6 - strategic_score) + (6 - business_score),
+        "Research Collaboration": (9 - tech_score) + team_score + strategic_score + market_score,
+        "Open Source": strategic_score + market_score + (6 - regulatory_score) + team_score,
+        "Government Procurement": tech_score + regulatory_score + market_score + business_score,
+    }
+
+def test_shipped_weights_match_original_formulas_for_every_state():
+    states = list(iter_states(TCP_DIMENSION_SIZES))
+    batch = pathway_engine.score_matrix(states).tolist()
+    for sums, row in zip(states, batch):
+        expected = original_pathway_scores(sums)
+        assert pathway_engine.score(sums) == expected, sums
+        assert dict(zip(pathway_engine.pathway_names, row)) == expected, sums
+
+def test_shipped_weights_line_up_with_the_question_data():
+    assert pathway_engine.dimensions == TCP_DIMENSION_KEYS
+    assert len(TCP_DIMENSION_KEYS) == len(TCP_DIMENSION_SIZES)
+    assert set(pathway_engine.pathway_names) == set(TCP_PATHWAY_NAMES)
+    check_pathway_engine(pathway_engine)
+
+@pytest.mark.parametrize('change', ['reorder', 'drop_pathway'])
+def test_misaligned_weights_are_rejected(tmp_path, change):
+    with open(WEIGHTS_PATH) as f:
+        config = json.load(f)
+    if change == 'reorder':
+        config['dimensions'][0], config['dimensions'][1] = config['dimensions'][1], config['dimensions'][0]
+    else:
+        config['pathways'].pop()
+    path = tmp_path / 'weights.json'
+    path.write_text(json.dumps(config))
+
+    with pytest.raises(ValueError):
+        check_pathway_engine(PathwayScoringEngine(str(path)))
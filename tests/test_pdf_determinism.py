@@ -0,0 +1,49 @@
+"""Identical inputs render byte-identical PDFs, whenever they are rendered,
+and the client-supplied assessment time is only printed, never stored."""
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from pdf_report import build_pdf_bytes
+
+TRL_REPORT = {
+    'mode': 'TRL',
+    'mode_full': 'Technology Readiness Level',
+    'technology_title': 'Determinism check',
+    'description': 'Rendered twice, a second apart',
+    'language': 'english',
+    'level': 3,
+    'explanation': 'Proof of concept demonstrated.',
+    'answers': [[True] * 4] * 3 + [[False] * 4],
+    'questions': [{'level': i, 'title': f'Level {i}', 'checks': [f'Check {j}' for j in range(4)]} for i in range(4)],
+    'timestamp': '2026-01-01T08:30:00'
+}
+
+def test_identical_inputs_render_identical_bytes():
+    first = build_pdf_bytes(TRL_REPORT, deterministic=True)
+    # PDF dates have one-second resolution; a clock leaking in would show here
+    time.sleep(1.1)
+    second = build_pdf_bytes(dict(TRL_REPORT), deterministic=True)
+
+    assert first.startswith(b'%PDF-')
+    assert first == second
+
+def test_different_inputs_render_different_bytes():
+    first = build_pdf_bytes(TRL_REPORT, deterministic=True)
+    second = build_pdf_bytes(dict(TRL_REPORT, level=4), deterministic=True)
+    assert first != second
+
+def test_row_keeps_server_time(database):
+    from email_outbox import EmailManager, EmailOutbox
+    from reports import generate_report
+
+    manager = EmailManager()
+    manager.email_user = manager.email_password = manager.admin_email = None
+    data = dict(TRL_REPORT, technology_title=f"Future {uuid.uuid4().hex[:8]}", timestamp='9999-12-31T00:00:00')
+
+    _, filename, assessment_id = generate_report(data, {}, EmailOutbox(manager))
+
+    assert filename.startswith('123199_')
+    with database.db_connection() as conn:
+        stored = conn.execute('SELECT timestamp FROM assessments WHERE id = %s', (assessment_id,)).fetchone()[0]
+    assert abs(stored - datetime.now()) < timedelta(minutes=5)
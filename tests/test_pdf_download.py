@@ -0,0 +1,53 @@
+"""Stored PDFs download through a real WSGI server, whatever their title."""
+import threading
+import urllib.request
+import uuid
+from urllib.parse import unquote
+from wsgiref.simple_server import WSGIRequestHandler, make_server
+
+import pytest
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture(scope='module')
+def server(database, app_module):
+    httpd = make_server('127.0.0.1', 0, app_module.app, handler_class=QuietHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+
+def stored_report(database, filename, pdf_bytes):
+    data = {'mode': 'TRL', 'language': 'english', 'technology_title': filename, 'answers': [[True]]}
+    return database.save_report(str(uuid.uuid4()), data, filename, pdf_bytes)
+
+def download(url, headers=None):
+    with urllib.request.urlopen(urllib.request.Request(url, headers=headers or {})) as response:
+        return response.status, response.headers, response.read()
+
+def test_non_ascii_filename_downloads(server, database):
+    filename = f"101826_Rice’s_Dryer_ñ_中_{uuid.uuid4().hex[:6]}_Report.pdf"
+    pdf_bytes = b'%PDF-' + b'x' * 100
+    assessment_id = stored_report(database, filename, pdf_bytes)
+
+    status, headers, body = download(f"{server}/admin/pdf/{assessment_id}")
+
+    assert status == 200
+    assert body == pdf_bytes
+    disposition = headers['Content-Disposition']
+    assert "filename*=UTF-8''" in disposition
+    assert unquote(disposition.split("filename*=UTF-8''", 1)[1]) == filename
+    assert 'filename=101826_Rices_Dryer_n__' in disposition
+
+def test_ascii_filename_and_range(server, database):
+    filename = f"101826_Plain_{uuid.uuid4().hex[:6]}_Report.pdf"
+    pdf_bytes = b'%PDF-' + bytes(range(200))
+    assessment_id = stored_report(database, filename, pdf_bytes)
+
+    status, headers, body = download(f"{server}/admin/pdf/{assessment_id}", {'Range': 'bytes=0-9'})
+
+    assert status == 206
+    assert body == pdf_bytes[:10]
+    assert headers['Content-Disposition'] == f"attachment; filename={filename}"
@@ -0,0 +1,53 @@
+"""A hung render restarts the pool without stranding the renders beside it."""
+import time
+import threading
+
+import pytest
+
+import pdf_report
+
+def fake_build_pdf_bytes(data, deterministic=None):
+    time.sleep(data['seconds'])
+    return b'%PDF-' + str(data['seconds']).encode()
+
+# Workers are forked, so they resolve the patched module attribute by name
+fake_build_pdf_bytes.__module__ = 'pdf_report'
+fake_build_pdf_bytes.__qualname__ = 'build_pdf_bytes'
+
+@pytest.fixture
+def render_pool(monkeypatch):
+    monkeypatch.setattr(pdf_report, 'build_pdf_bytes', fake_build_pdf_bytes)
+    monkeypatch.setenv('PDF_RENDER_START_METHOD', 'fork')
+    monkeypatch.setenv('PDF_RENDER_WORKERS', '2')
+    monkeypatch.setenv('PDF_RENDER_TIMEOUT', '1.5')
+    pool = pdf_report.PDFRenderPool()
+    yield pool
+    if pool._pool is not None:
+        pool._pool.terminate()
+
+def test_timeout_fails_sibling_renders_immediately(render_pool):
+    assert render_pool.render({'seconds': 0}) == b'%PDF-0'
+
+    outcomes = {}
+    def render(name, seconds):
+        start = time.monotonic()
+        try:
+            render_pool.render({'seconds': seconds})
+            outcomes[name] = ('ok', time.monotonic() - start)
+        except pdf_report.RenderTimeout:
+            outcomes[name] = ('timeout', time.monotonic() - start)
+
+    hung = threading.Thread(target=render, args=('hung', 30))
+    hung.start()
+    time.sleep(0.5)
+    # Started later, so its own timeout would only expire after the hung one's
+    sibling = threading.Thread(target=render, args=('sibling', 30))
+    sibling.start()
+    hung.join(10)
+    sibling.join(10)
+
+    assert outcomes['hung'][0] == 'timeout'
+    assert outcomes['sibling'][0] == 'timeout'
+    assert outcomes['sibling'][1] < 1.5
+    # A fresh pool serves the next render
+    assert render_pool.render({'seconds': 0.1}) == b'%PDF-0.1'
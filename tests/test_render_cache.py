@@ -0,0 +1,43 @@
+"""Render cache keys cover everything the PDF prints, and the disk tier stays bounded."""
+import os
+import time
+
+from render_cache import RenderCache, render_key
+
+PAYLOAD = {
+    'mode': 'TRL',
+    'language': 'english',
+    'answers': [1, 1, 0],
+    'technology_title': 'Solar Dryer',
+    'description': 'A dryer',
+    'timestamp': '2024-01-02T03:04:05',
+    'level': 3,
+    'explanation': 'Proof of concept'
+}
+
+def test_key_covers_printed_fields():
+    assert render_key(PAYLOAD) == render_key(dict(PAYLOAD))
+    for field, value in (('level', 4), ('explanation', 'Prototype'), ('recommended_pathway', 'Licensing'),
+                         ('detailed_analysis', {'x': 1}), ('questions', ['Q1'])):
+        assert render_key(dict(PAYLOAD, **{field: value})) != render_key(PAYLOAD), field
+
+def test_key_changes_with_pathway_weights(monkeypatch):
+    import pathway_scoring
+    before = render_key(PAYLOAD)
+    monkeypatch.setattr(pathway_scoring.pathway_engine, 'fingerprint', 'retuned')
+    assert render_key(PAYLOAD) != before
+
+def test_disk_tier_evicts_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setenv('PDF_CACHE_DIR', str(tmp_path))
+    monkeypatch.setenv('PDF_CACHE_DIR_MAX_BYTES', '3000')
+    cache = RenderCache()
+    for n in range(3):
+        cache.put(f"{n:02d}" * 32, b'x' * 1000)
+        time.sleep(0.01)
+    # Reading the oldest entry back from disk makes it the most recently used
+    cache._entries.clear()
+    assert cache.get('00' * 32) is not None
+    cache.put('03' * 32, b'x' * 1000)
+
+    remaining = sorted(name for _, _, names in os.walk(tmp_path) for name in names)
+    assert remaining == [f"{'00' * 32}.pdf", f"{'02' * 32}.pdf", f"{'03' * 32}.pdf"]
@@ -0,0 +1,21 @@
+"""The background schema bootstrap gives up at once without database settings."""
+import threading
+
+import database_functions
+
+def test_bootstrap_stops_when_database_not_configured(monkeypatch):
+    for name in ('DATABASE_HOST', 'DATABASE_NAME', 'DATABASE_USER', 'DATABASE_PASSWORD'):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(database_functions, '_schema_ready', threading.Event())
+    monkeypatch.setattr(database_functions, '_schema_unconfigured', False)
+    monkeypatch.setattr(database_functions, '_schema_thread', None)
+    monkeypatch.setattr(database_functions, 'SCHEMA_RETRY_SECONDS', 0)
+
+    database_functions.start_schema_bootstrap()
+    database_functions._schema_thread.join(timeout=5)
+
+    assert not database_functions._schema_thread.is_alive()
+    assert database_functions._schema_unconfigured
+    first_thread = database_functions._schema_thread
+    database_functions.start_schema_bootstrap()
+    assert database_functions._schema_thread is first_thread
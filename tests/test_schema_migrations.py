@@ -0,0 +1,39 @@
+"""No-transaction migrations are split only on top-level semicolons."""
+import pytest
+
+from schema_migrations import load_migrations, split_statements
+
+def test_semicolons_inside_comments_strings_and_bodies_are_kept():
+    sql = """-- migrate: no-transaction
+-- a comment; with a semicolon
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_a ON t (x);
+/* block; /* nested; */ still */
+COMMENT ON TABLE t IS 'it''s; fine';
+SELECT E'back\\'slash;', "odd;name" FROM t;
+DO $body$ BEGIN PERFORM 1; END $body$;
+DO $$ BEGIN RAISE NOTICE 'x;'; END $$;
+-- trailing comment only
+"""
+    statements = split_statements(sql)
+
+    assert len(statements) == 5
+    assert statements[0].endswith('CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_a ON t (x)')
+    assert statements[1].endswith("COMMENT ON TABLE t IS 'it''s; fine'")
+    assert statements[2] == 'SELECT E\'back\\\'slash;\', "odd;name" FROM t'
+    assert statements[3] == 'DO $body$ BEGIN PERFORM 1; END $body$'
+    assert statements[4] == "DO $$ BEGIN RAISE NOTICE 'x;'; END $$"
+
+def test_positional_parameters_are_not_dollar_quotes():
+    assert split_statements('SELECT $1; SELECT $2') == ['SELECT $1', 'SELECT $2']
+
+@pytest.mark.parametrize('sql', ["SELECT 'open", 'DO $$ BEGIN', '/* open', 'SELECT "open'])
+def test_unterminated_text_is_rejected(sql):
+    with pytest.raises(ValueError):
+        split_statements(sql)
+
+def test_shipped_no_transaction_migrations():
+    for migration in load_migrations():
+        if not migration.transactional:
+            statements = migration.statements()
+            assert statements
+            assert all(';' not in statement for statement in statements), migration.label
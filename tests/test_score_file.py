@@ -0,0 +1,35 @@
+"""The offline scorer streams a file in chunks and rejects chunk sizes that score nothing."""
+import json
+
+import pytest
+
+import score_file
+
+def write_jsonl(path, count):
+    with open(path, 'w', encoding='utf-8') as f:
+        for index in range(count):
+            f.write(json.dumps({'mode': 'TRL', 'language': 'english', 'technology_title': f'T{index}',
+                                'description': 'd', 'answers': [[True] * 5]}) + "\n")
+        f.write("not json\n")
+
+def test_scores_every_line_across_chunks(tmp_path):
+    source, target = tmp_path / 'in.jsonl', tmp_path / 'out.jsonl'
+    write_jsonl(source, 5)
+
+    score_file.main([str(source), '-o', str(target), '--chunk-size', '2'])
+
+    results = [json.loads(line) for line in target.read_text(encoding='utf-8').splitlines()]
+    assert [result['index'] for result in results] == list(range(6))
+    assert all('error' not in result for result in results[:5])
+    assert results[5]['error'].startswith('Invalid JSON')
+
+@pytest.mark.parametrize('chunk_size', ['0', '-3', 'many'])
+def test_chunk_size_below_one_is_rejected(tmp_path, capsys, chunk_size):
+    source = tmp_path / 'in.jsonl'
+    write_jsonl(source, 1)
+
+    with pytest.raises(SystemExit) as exit_info:
+        score_file.main([str(source), '--chunk-size', chunk_size])
+
+    assert exit_info.value.code == 2
+    assert '--chunk-size' in capsys.readouterr().err
@@ -0,0 +1,57 @@
+"""The committed TCP decision table matches the scoring code for every state."""
+import json
+import itertools
+
+import pytest
+
+import scoring
+from pathway_scoring import WEIGHTS_PATH, PathwayScoringEngine
+from tcp_table import TABLE_MAGIC, TCPDecisionTable, iter_states, write_table
+from scoring import (
+    TCP_DIMENSION_SIZES, TCP_PATHWAY_NAMES, TCP_TABLE_PATH, decide_tcp_state, tcp_decision_table,
+    tcp_scoring_source_hash
+)
+
+def retuned_engine(tmp_path, scale, bias=0):
+    with open(WEIGHTS_PATH) as f:
+        config = json.load(f)
+    for pathway in config['pathways']:
+        pathway['weights'] = [weight * scale for weight in pathway['weights']]
+        pathway['bias'] = pathway.get('bias', 0) + bias
+    path = tmp_path / 'weights.json'
+    path.write_text(json.dumps(config))
+    return PathwayScoringEngine(str(path))
+
+def test_committed_table_is_current():
+    with open(TCP_TABLE_PATH, 'rb') as f:
+        assert f.readline() == TABLE_MAGIC
+        header = json.loads(f.readline())
+    # Regenerate with: flask build-tcp-table
+    assert header['source_hash'] == tcp_scoring_source_hash()
+
+def test_lookup_matches_scoring_for_every_state():
+    states = 0
+    for sums in iter_states(TCP_DIMENSION_SIZES):
+        assert tcp_decision_table.lookup(sums) == decide_tcp_state(sums), sums
+        states += 1
+    assert states == 42875
+
+@pytest.mark.parametrize('scale, bias, score_type', [(1.5, 0.5, 'd'), (10, 0, 'h')])
+def test_retuned_weights_build_a_matching_table(tmp_path, monkeypatch, scale, bias, score_type):
+    """Fractional weights and scores past the int8 range are stored exactly"""
+    monkeypatch.setattr(scoring, 'pathway_engine', retuned_engine(tmp_path, scale, bias))
+    path = str(tmp_path / 'table.bin')
+    write_table(path, 'retuned', TCP_DIMENSION_SIZES, TCP_PATHWAY_NAMES, decide_tcp_state)
+
+    with open(path, 'rb') as f:
+        f.readline()
+        assert json.loads(f.readline())['score_type'] == score_type
+    table = TCPDecisionTable(path, 'retuned', TCP_DIMENSION_SIZES, TCP_PATHWAY_NAMES)
+    for sums in itertools.islice(iter_states(TCP_DIMENSION_SIZES), 0, None, 97):
+        assert table.lookup(sums) == decide_tcp_state(sums), sums
+
+def test_non_numeric_weights_are_rejected(tmp_path):
+    path = tmp_path / 'weights.json'
+    path.write_text(json.dumps({'dimensions': ['a', 'b'], 'pathways': [{'name': 'P', 'weights': [1, '2']}]}))
+    with pytest.raises(ValueError):
+        PathwayScoringEngine(str(path))